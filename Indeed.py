@@ -1,29 +1,52 @@
 """
 Indeed Jobs Scraper (JobSpy)
 - Scrapes Indeed via JobSpy for company groups/aliases across selected countries
+- Runs every search from one shared, rate-limited queue (adaptive pacing, per-country circuit breakers)
 - Writes one JSON per company group + summary.json
 - Outputs common job fields + search/provenance metadata
-- Expands to cities if country search hits ~1000 cap
-- Enforces exact company-name matching; saves mismatch examples
+- Expands to cities (or region -> city with --geo-partitioning) if a country search hits ~1000 cap
+- Enforces exact company-name matching; routes mismatches to their owning group, saves the rest as examples
+Modes
+- --incremental: fetch only postings newer than each search's watermark and merge into the existing files
+- --resume: continue an interrupted run from its journal (--fresh discards it instead)
+- --cache-ttl: reuse identical searches cached on disk
+- --coordinator / --worker: hand searches to worker processes through a shared SQLite queue
+- --shard i/N, then --merge: split one run across hosts and combine their outputs
+- --time-budget: run the highest-yield searches first and skip what does not fit
+- --self-check, --benchmark-*: equivalence checks and timings on saved jobs, then exit
 """
 
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
 import hashlib
 import inspect
 import json
 import logging
 import math
+import multiprocessing
 import os
+import pickle
+import queue
 import random
 import re
+import socket
+import sqlite3
+import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Tuple
-
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
 import pandas as pd
 from jobspy import scrape_jobs
 
@@ -35,16 +58,78 @@ class Config:
     output_dir: str = "indeed_json"
     results_wanted: int = 1000
     hours_old: Optional[int] = None  # e.g. 168 for last 7 days
+    incremental: bool = False  # derive hours_old per search from its watermark and merge into existing files
+    watermark_overlap_hours: int = 6
 
-    sleep_between_searches: float = 1.25
+    sleep_between_searches: float = 1.25  # seeds the starting request rate
     random_jitter_seconds: float = 0.50
 
     max_workers: int = 5
+    requests_per_second: Optional[float] = None  # None -> max_workers / sleep_between_searches
+    rate_burst: int = 5
+
+    adaptive_pacing: bool = True
+    min_requests_per_second: float = 0.1
+    max_requests_per_second: float = 10.0
+    aimd_increase: float = 0.05  # req/s added per healthy response
+    aimd_decrease: float = 0.5  # rate multiplier on errors / empty streaks / slow responses
+    aimd_cooldown_seconds: float = 5.0  # at most one decrease per window
+    aimd_latency_threshold_seconds: float = 20.0
+    aimd_empty_streak: int = 5
+
+    breaker_failure_threshold: int = 5  # consecutive failed searches before a country's breaker opens
+    breaker_cooldown_seconds: float = 60.0
+    breaker_max_trips: int = 3  # after this many trips the country's remaining searches are skipped
+    breaker_skip_when_open: bool = False  # skip instead of deferring searches while open
+
+    isolate_searches: bool = False  # run each jobspy call in a killable subprocess
+    search_timeout_seconds: float = 180.0
+    max_result_bytes: int = 64 * 1024 * 1024
+
+    queue_db: Optional[str] = None  # coordinator mode: searches are leased to --worker processes via this SQLite file
+    lease_seconds: float = 60.0  # a lease not renewed within this window is re-queued
+    lease_max_attempts: int = 3  # expiries before the search fails as a timeout
+    queue_poll_seconds: float = 0.2
+
+    enrich_processes: int = 0  # >0: each search thread hands its batch to one of this many processes and waits for it
+    enrich_min_batch_rows: int = 20  # smaller batches are enriched in the calling thread
+    enrich_memo_size: int = 4096  # LRU entries of text-derived enrichment per process (0 = off)
+
+    cache_ttl_seconds: Optional[float] = None  # reuse identical searches from disk within this window (None = off)
+    cache_dir: Optional[str] = None  # None -> <output_dir>/search_cache
+    cache_max_bytes: int = 512 * 1024 * 1024  # oldest entries are evicted beyond this
+
+    dedupe_index: bool = False  # flag postings already collected by another group or an earlier run
+    dedupe_index_file: Optional[str] = None  # persist the index here between runs (None = this run only)
+    dedupe_bloom_bytes: int = 0  # Bloom filter in front of the index (0 = off)
+
+    near_duplicates: bool = False  # cluster reposted / multi-city postings by SimHash of title + description
+    near_dup_max_distance: int = 3  # Hamming bits between signatures in one cluster
+    collapse_near_duplicates: bool = False  # save one record per cluster with its locations
+
+    description_store: bool = False  # keep each distinct description once on disk; records carry description_hash
+    description_store_dir: Optional[str] = None  # None -> <output_dir>/descriptions
+
     max_retries: int = 3
     retry_base_seconds: float = 2.0
     retry_max_seconds: float = 20.0
     enforce_exact_company_match: bool = True
+    route_mismatches: bool = True  # hand mismatched rows to the group that owns the company name
+    combine_aliases: bool = False  # one OR query per group (chunked by max_query_length)
+    max_query_length: int = 250
+    geo_partitioning: bool = False  # capped country -> province/state -> city, only where still capped
+    partition_prune_after: int = 3  # consecutive zero-yield runs before a partition is pruned
+    partition_probe_every: int = 5  # pruned partitions are searched again after this many skipped runs
+    marginal_yield_threshold: int = 1  # a city adding fewer new jobs than this counts as low-yield
+    marginal_yield_patience: int = 0  # stop a city expansion after N low-yield cities in a row (0 = off)
+    dead_search_after: int = 0  # demote (alias, country) searches with zero matched rows for K runs (0 = off)
+    dead_search_probe_every: int = 7  # demoted searches still run once per this many runs
     checkpoint_every_n_requests: int = 250
+    group_cost_prior_seconds: float = 30.0  # predicted cost for groups with no run history
+    request_cost_prior_seconds: float = 4.0  # used when history has requests but no elapsed time
+    time_budget_seconds: Optional[float] = None  # stop starting new searches once spent
+    shard_index: int = 1  # this host's 1-based shard of shard_count
+    shard_count: int = 1
     log_level: str = "INFO"
 
 
@@ -110,6 +195,38 @@ INDEED_CITY_LOCATIONS: Dict[str, List[str]] = {
 }
 
 
+# Intermediate level for --geo-partitioning; only regions that have cities above are used
+INDEED_REGION_NAMES: Dict[str, Dict[str, str]] = {
+    "Canada": {
+        "ON": "Ontario",
+        "QC": "Quebec",
+        "BC": "British Columbia",
+        "AB": "Alberta",
+        "MB": "Manitoba",
+        "NS": "Nova Scotia",
+        "SK": "Saskatchewan",
+        "NL": "Newfoundland and Labrador",
+    },
+    "United States": {
+        "NY": "New York State",
+        "NJ": "New Jersey",
+        "PA": "Pennsylvania",
+        "DC": "District of Columbia",
+        "MA": "Massachusetts",
+        "IL": "Illinois",
+        "GA": "Georgia",
+        "FL": "Florida",
+        "TX": "Texas",
+        "CO": "Colorado",
+        "AZ": "Arizona",
+        "MN": "Minnesota",
+        "WA": "Washington State",
+        "OR": "Oregon",
+        "CA": "California",
+    },
+}
+
+
 COMPANY_GROUPS: Dict[str, List[str]] = {
     "RBC": [
         "RBC",
@@ -300,29 +417,66 @@ def setup_logging(level: str) -> logging.Logger:
 
 # HELPERS
 
-REMOTE_RE = re.compile(r"\b(remote|work from home|wfh|telecommute|telecommuting)\b", re.IGNORECASE)
-HYBRID_RE = re.compile(r"\b(hybrid)\b", re.IGNORECASE)
-ONSITE_RE = re.compile(r"\b(on[- ]?site|in[- ]office|in the office)\b", re.IGNORECASE)
+# Signal name -> alternation of words; every alternative starts with a letter.
+SIGNAL_WORDS = {
+    "hybrid": r"hybrid",
+    "remote": r"remote|work from home|wfh|telecommute|telecommuting",
+    "onsite": r"on[- ]?site|in[- ]office|in the office",
+    "fulltime": r"full[- ]?time",
+    "parttime": r"part[- ]?time",
+    "contract": r"contract|fixed[- ]term",
+    "temporary": r"temporary|temp",
+    "internship": r"intern|internship|co-?op",
+}
+
 
-FULLTIME_RE = re.compile(r"\b(full[- ]?time)\b", re.IGNORECASE)
-PARTTIME_RE = re.compile(r"\b(part[- ]?time)\b", re.IGNORECASE)
-CONTRACT_RE = re.compile(r"\b(contract|fixed[- ]term)\b", re.IGNORECASE)
-TEMP_RE = re.compile(r"\b(temporary|temp)\b", re.IGNORECASE)
-INTERN_RE = re.compile(r"\b(intern|internship|co-?op)\b", re.IGNORECASE)
+def signal_re(words: str) -> re.Pattern:
+    return re.compile(rf"\b({words})\b", re.IGNORECASE)
+
+
+REMOTE_RE = signal_re(SIGNAL_WORDS["remote"])
+HYBRID_RE = signal_re(SIGNAL_WORDS["hybrid"])
+ONSITE_RE = signal_re(SIGNAL_WORDS["onsite"])
+
+FULLTIME_RE = signal_re(SIGNAL_WORDS["fulltime"])
+PARTTIME_RE = signal_re(SIGNAL_WORDS["parttime"])
+CONTRACT_RE = signal_re(SIGNAL_WORDS["contract"])
+TEMP_RE = signal_re(SIGNAL_WORDS["temporary"])
+INTERN_RE = signal_re(SIGNAL_WORDS["internship"])
+
+SIGNAL_PATTERNS = tuple((name, signal_re(words)) for name, words in SIGNAL_WORDS.items())
+
+# All of the above as one alternation, so a text is scanned once for every signal.
+# No two of them can match overlapping words, so finditer reports each one present.
+# The lookahead lists every alternative's first letter, which lets most positions
+# fail after one or two checks.
+SIGNAL_RE = re.compile(
+    r"\b(?=[" + "".join(sorted({alt[0] for words in SIGNAL_WORDS.values() for alt in words.split("|")})) + r"])(?:"
+    + "|".join(f"(?P<{name}>{words})" for name, words in SIGNAL_WORDS.items())
+    + r")\b",
+    re.IGNORECASE,
+)
+EMPLOYMENT_TYPES = ("contract", "fulltime", "internship", "parttime", "temporary")  # output order
+
+SALARY_CURRENCY = r"\$|USD|CAD|AUD|NZD|SGD|HKD|GBP|£|EUR|€"
 
 SALARY_RANGE_RE = re.compile(
-    r"(?P<currency>\$|USD|CAD|AUD|NZD|SGD|HKD|GBP|£|EUR|€)\s*"
+    rf"(?P<currency>{SALARY_CURRENCY})\s*"
     r"(?P<min>[\d,]+(?:\.\d+)?)\s*[-–]\s*(?P<max>[\d,]+(?:\.\d+)?)"
     r"(?:\s*(?:per|/)\s*(?P<interval>year|yr|month|mo|week|wk|day|hour|hr))?",
     re.IGNORECASE,
 )
 SALARY_SINGLE_RE = re.compile(
-    r"(?P<currency>\$|USD|CAD|AUD|NZD|SGD|HKD|GBP|£|EUR|€)\s*"
+    rf"(?P<currency>{SALARY_CURRENCY})\s*"
     r"(?P<amount>[\d,]+(?:\.\d+)?)"
     r"(?:\s*(?:per|/)\s*(?P<interval>year|yr|month|mo|week|wk|day|hour|hr))?",
     re.IGNORECASE,
 )
 
+# The currency token every salary match starts with, under the same flags as the
+# patterns above; parse_salary_fast only tries them where this matches.
+SALARY_START_RE = re.compile(SALARY_CURRENCY, re.IGNORECASE)
+
 INTERVAL_MAP = {
     "year": "yearly", "yr": "yearly",
     "month": "monthly", "mo": "monthly",
@@ -382,6 +536,66 @@ def atomic_write_json(path: str, data: Any) -> None:
     os.replace(tmp, path)
 
 
+# DataFrames as JSON for the search cache and the work queue. Dates and
+# timestamps are tagged and each column keeps its dtype, so a frame read back
+# enriches exactly like the one jobspy returned.
+
+def json_cell(v: Any) -> Any:
+    if v is pd.NaT or isinstance(v, pd.Timestamp):
+        return {"$timestamp": None if v is pd.NaT else v.isoformat()}
+    if isinstance(v, datetime):
+        return {"$datetime": v.isoformat()}
+    if isinstance(v, date):
+        return {"$date": v.isoformat()}
+    if isinstance(v, np.generic):
+        return json_cell(v.item())
+    if isinstance(v, (list, tuple)):
+        return [json_cell(x) for x in v]
+    if isinstance(v, dict):
+        return {k: json_cell(x) for k, x in v.items()}
+    return v
+
+
+def restore_cell(d: Dict[str, Any]) -> Any:
+    if len(d) == 1:
+        (tag, value), = d.items()
+        if tag == "$timestamp":
+            return pd.Timestamp(value)
+        if tag == "$datetime":
+            return datetime.fromisoformat(value)
+        if tag == "$date":
+            return date.fromisoformat(value)
+    return d
+
+
+def frame_to_json(df: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "columns": [str(c) for c in df.columns],
+        "dtypes": [str(t) for t in df.dtypes],
+        "data": [[json_cell(v) for v in df.iloc[:, i].tolist()] for i in range(df.shape[1])],
+    }
+
+
+def frame_from_json(body: Dict[str, Any]) -> pd.DataFrame:
+    df = pd.DataFrame({i: pd.Series(values, dtype=object) for i, values in enumerate(body.get("data") or [])})
+    df.columns = body.get("columns") or []
+    for name, dtype in zip(df.columns, body.get("dtypes") or []):
+        if dtype != "object":
+            try:
+                df[name] = df[name].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+    return df
+
+
+def dumps_frame(body: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(body, ensure_ascii=False, default=str).encode("utf-8"), 6)
+
+
+def loads_frame(payload: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(payload).decode("utf-8"), object_hook=restore_cell)
+
+
 def safe_filename(name: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")
 
@@ -415,6 +629,26 @@ def stable_dedupe_key(job: Dict[str, Any]) -> str:
     return hashlib.sha1(raw).hexdigest()
 
 
+DEDUPE_KEY_FIELDS = ("site", "id", "job_url", "job_url_direct", "title", "company", "location")
+
+
+def dedupe_key_series(df: pd.DataFrame) -> pd.Series:
+    """stable_dedupe_key for every row of a raw frame, without building row dicts."""
+    n = len(df)
+    cols = [df[f].tolist() if f in df.columns else [None] * n for f in DEDUPE_KEY_FIELDS]
+    keys = [
+        hashlib.sha1("||".join(str(norm(v) or "") for v in values).encode("utf-8", errors="ignore")).hexdigest()
+        for values in zip(*cols)
+    ]
+    return pd.Series(keys, index=df.index, dtype=object)
+
+
+def clean_lower_series(col: pd.Series) -> pd.Series:
+    """to_clean_lower over a column; missing and blank values become None."""
+    out = col.astype(str).str.strip().str.lower()
+    return out.where(col.notna() & (out != ""), None)
+
+
 def to_clean_lower(x: Any) -> Optional[str]:
     if is_missing(x):
         return None
@@ -431,37 +665,51 @@ def make_allowed_company_set(aliases: List[str]) -> Set[str]:
     return out
 
 
-def company_exact_allowed(job_company: Any, allowed_company_lc: Set[str]) -> bool:
-    jc = to_clean_lower(job_company)
-    if not jc:
-        return False
-    return jc in allowed_company_lc
+def build_alias_index(company_groups: Dict[str, List[str]]) -> Dict[str, str]:
+    # Lowercase alias -> owning group; the first group listing an alias owns it.
+    index: Dict[str, str] = {}
+    for cg, aliases in company_groups.items():
+        for alias in make_allowed_company_set(aliases):
+            index.setdefault(alias, cg)
+    return index
 
 
-def infer_work_arrangement(title: str, location: str, desc: str) -> Optional[str]:
-    text = f"{title}\n{location}\n{desc}".strip()
-    if not text:
-        return None
-    if HYBRID_RE.search(text):
+def text_signals(text: str) -> Set[str]:
+    return {m.lastgroup for m in SIGNAL_RE.finditer(text)} if text else set()
+
+
+def lowered_signals(text: str, signals: Set[str]) -> Set[str]:
+    # text_signals(text.lower()), reusing signals already found in text. Employment
+    # types have always been matched on lowercased text, and str.lower() differs from
+    # IGNORECASE only outside ASCII (e.g. "İ" lowers to "i" plus a combining dot).
+    return signals if text.isascii() else text_signals(text.lower())
+
+
+def arrangement_from_signals(signals: Set[str], location: str) -> Optional[str]:
+    if "hybrid" in signals:
         return "hybrid"
-    if REMOTE_RE.search(text) or (location.strip().lower() == "remote"):
+    if "remote" in signals or (location.strip().lower() == "remote"):
         return "remote"
-    if ONSITE_RE.search(text):
+    if "onsite" in signals:
         return "onsite"
     return None
 
 
-def infer_employment_types(title: str, desc: str, job_type_raw: Optional[str]) -> Optional[List[str]]:
-    text = f"{title}\n{desc}\n{job_type_raw or ''}".lower()
-    found: Set[str] = set()
+def employment_from_signals(signals: Set[str]) -> Optional[List[str]]:
+    found = [t for t in EMPLOYMENT_TYPES if t in signals]
+    return found or None
 
-    if FULLTIME_RE.search(text): found.add("fulltime")
-    if PARTTIME_RE.search(text): found.add("parttime")
-    if CONTRACT_RE.search(text): found.add("contract")
-    if TEMP_RE.search(text): found.add("temporary")
-    if INTERN_RE.search(text): found.add("internship")
 
-    return sorted(found) if found else None
+def classify_job(title: str, location: str, desc: str, job_type_raw: Optional[str]) -> Tuple[Optional[str], Optional[List[str]]]:
+    """(work_arrangement, employment_types) with each field scanned once."""
+    title_sig, desc_sig = text_signals(title), text_signals(desc)
+    wa = None
+    if title.strip() or location.strip() or desc.strip():
+        wa = arrangement_from_signals(title_sig | text_signals(location) | desc_sig, location)
+    job_type = job_type_raw or ""
+    return wa, employment_from_signals(
+        lowered_signals(title, title_sig) | lowered_signals(desc, desc_sig) | text_signals(job_type.lower())
+    )
 
 
 def infer_currency(country: str, symbol_or_code: Optional[str]) -> Optional[str]:
@@ -537,46 +785,749 @@ def posted_days_ago(date_posted: Optional[str], scraped_at_iso: str) -> Optional
     return int((sa - dp).days)
 
 
-def safe_sleep(cfg: Config) -> None:
-    time.sleep(cfg.sleep_between_searches + random.random() * cfg.random_jitter_seconds)
+# RATE LIMITING
+
+class TokenBucket:
+    """Global request budget shared by every search worker."""
+
+    def __init__(self, rate: float, burst: int, jitter_seconds: float = 0.0) -> None:
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = float(max(1, burst))
+        self.jitter_seconds = max(0.0, float(jitter_seconds))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    break
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+        if self.jitter_seconds:
+            jitter = random.random() * self.jitter_seconds
+            time.sleep(jitter)
+            waited += jitter
+        return waited
+
+    def record(self, outcome: str, latency: float) -> None:
+        pass
+
+    def summary(self) -> Dict[str, Any]:
+        return {"adaptive": False, "current_rate": round(self.rate, 3)}
+
+
+class AdaptivePacer(TokenBucket):
+    """AIMD on the shared request rate: healthy responses nudge it up; errors and slow or empty runs cut it."""
+
+    MAX_DECISIONS = 200
+
+    def __init__(self, cfg: Config, rate: float) -> None:
+        super().__init__(rate, cfg.rate_burst, cfg.random_jitter_seconds)
+        self.cfg = cfg
+        self.min_rate = max(1e-3, cfg.min_requests_per_second)
+        self.max_rate = max(self.min_rate, cfg.max_requests_per_second)
+        self.rate = min(self.max_rate, max(self.min_rate, self.rate))
+        self.initial_rate = self.rate
+        self.lowest_rate = self.highest_rate = self.rate
+        self.empty_streak = 0
+        self.last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.outcomes: Dict[str, int] = {}
+        self.decisions: List[Dict[str, Any]] = []
+
+    def record(self, outcome: str, latency: float) -> None:
+        with self.lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            # Plain "empty" is a normal answer for a company with no postings; only
+            # empties where history says rows should exist count toward a streak.
+            if outcome == "empty_unexpected":
+                self.empty_streak += 1
+            elif outcome == "ok":
+                self.empty_streak = 0
+
+            reason: Optional[str] = None
+            if outcome not in ("ok", "empty", "empty_unexpected", "permanent"):
+                reason = outcome
+            elif latency > self.cfg.aimd_latency_threshold_seconds:
+                reason = "slow"
+            elif outcome == "empty_unexpected" and self.empty_streak >= self.cfg.aimd_empty_streak:
+                reason = "empty_streak"
+                self.empty_streak = 0
+
+            if reason is None:
+                if outcome == "ok":
+                    self.rate = min(self.max_rate, self.rate + self.cfg.aimd_increase)
+                    self.increases += 1
+                    self.highest_rate = max(self.highest_rate, self.rate)
+                return
+
+            now = time.monotonic()
+            if now - self.last_decrease < self.cfg.aimd_cooldown_seconds:
+                return
+            old = self.rate
+            self.rate = max(self.min_rate, self.rate * self.cfg.aimd_decrease)
+            self.last_decrease = now
+            self.decreases += 1
+            self.lowest_rate = min(self.lowest_rate, self.rate)
+            self.decisions.append({
+                "at": utc_now_iso(),
+                "reason": reason,
+                "latency_seconds": round(latency, 2),
+                "rate_before": round(old, 3),
+                "rate_after": round(self.rate, 3),
+            })
+            del self.decisions[:-self.MAX_DECISIONS]
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "adaptive": True,
+                "current_rate": round(self.rate, 3),
+                "initial_rate": round(self.initial_rate, 3),
+                "lowest_rate": round(self.lowest_rate, 3),
+                "highest_rate": round(self.highest_rate, 3),
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "outcomes": dict(self.outcomes),
+                "decisions": list(self.decisions),
+            }
+
+
+def make_rate_limiter(cfg: Config) -> TokenBucket:
+    # Default keeps the old aggregate budget: max_workers threads each pausing sleep_between_searches.
+    rate = cfg.requests_per_second
+    if rate is None or rate <= 0:
+        rate = max(1, cfg.max_workers) / max(cfg.sleep_between_searches, 1e-3)
+    if cfg.adaptive_pacing:
+        return AdaptivePacer(cfg, rate)
+    return TokenBucket(rate, cfg.rate_burst, cfg.random_jitter_seconds)
 
 
 # SCRAPE WRAPPER
 
-def call_scrape_jobs(kwargs: Dict[str, Any]) -> pd.DataFrame:
+def filter_scrape_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
     sig = inspect.signature(scrape_jobs)
-    filtered = {k: v for k, v in kwargs.items() if k in sig.parameters}
-    return scrape_jobs(**filtered)
+    return {k: v for k, v in kwargs.items() if k in sig.parameters}
 
 
-def scrape_with_retries(
+def call_scrape_jobs(kwargs: Dict[str, Any]) -> pd.DataFrame:
+    return scrape_jobs(**filter_scrape_kwargs(kwargs))
+
+
+def build_scrape_kwargs(
     cfg: Config,
     *,
     search_term: str,
     country_indeed: str,
     location: str,
-) -> Tuple[pd.DataFrame, Optional[str]]:
-    base_kwargs = {
+    query: Optional[str] = None,
+    hours_old: Optional[int] = None,
+) -> Dict[str, Any]:
+    return {
         "site_name": ["indeed"],
-        "search_term": f'"{search_term}"',  # exact phrase
+        "search_term": query or f'"{search_term}"',  # exact phrase
         "location": location,
         "results_wanted": int(cfg.results_wanted),
-        "hours_old": cfg.hours_old,
+        "hours_old": hours_old if hours_old is not None else cfg.hours_old,
         "country_indeed": country_indeed,
         "linkedin_fetch_description": False,
     }
 
+
+# SEARCH CACHE
+
+class SearchCache:
+    """scrape_jobs results on disk as compressed JSON, reused within the TTL; failed searches are never cached."""
+
+    SUFFIX = ".json.z"  # never pickle: the cache dir may be shared
+
+    def __init__(self, cfg: Config, logger: logging.Logger) -> None:
+        self.dir = cfg.cache_dir or os.path.join(cfg.output_dir, "search_cache")
+        self.ttl = float(cfg.cache_ttl_seconds or 0)
+        self.max_bytes = int(cfg.cache_max_bytes)
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(self.dir, exist_ok=True)
+        self.sizes: Dict[str, int] = {}
+        for name in os.listdir(self.dir):
+            if name.endswith(self.SUFFIX):
+                try:
+                    self.sizes[name] = os.path.getsize(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+        if sum(self.sizes.values()) > self.max_bytes:
+            self.evict()
+
+    def key(self, kwargs: Dict[str, Any]) -> str:
+        blob = json.dumps(filter_scrape_kwargs(kwargs), sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32] + self.SUFFIX
+
+    def drop(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self.dir, name))
+        except OSError:
+            pass
+        self.sizes.pop(name, None)
+
+    def get(self, kwargs: Dict[str, Any]) -> Optional[Tuple[pd.DataFrame, str]]:
+        name = self.key(kwargs)
+        path = os.path.join(self.dir, name)
+        try:
+            with open(path, "rb") as f:
+                body = loads_frame(f.read())
+            cached_at, df = body["cached_at"], frame_from_json(body)
+            fresh = (datetime.now(timezone.utc) - datetime.fromisoformat(cached_at)).total_seconds() < self.ttl
+        except FileNotFoundError:
+            fresh = False
+        except Exception as e:
+            self.logger.warning(f"[CACHE_SKIP] {name}: {type(e).__name__}: {e}")
+            fresh = False
+        with self.lock:
+            if not fresh:
+                if name in self.sizes:
+                    self.drop(name)
+                return None
+            self.hits += 1
+        return df, cached_at
+
+    def record_miss(self) -> None:
+        # Counted by the caller once the search is actually sent: a search deferred
+        # by an open breaker looks itself up again each time it comes around.
+        with self.lock:
+            self.misses += 1
+
+    def put(self, kwargs: Dict[str, Any], df: pd.DataFrame) -> None:
+        name = self.key(kwargs)
+        payload = dumps_frame({"cached_at": utc_now_iso(), **frame_to_json(df)})
+        if len(payload) > self.max_bytes:
+            return
+        path = os.path.join(self.dir, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError as e:
+            self.logger.warning(f"[CACHE_WRITE_FAIL] {name}: {type(e).__name__}: {e}")
+            return
+        with self.lock:
+            self.sizes[name] = len(payload)
+            if sum(self.sizes.values()) > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        def mtime(name: str) -> float:
+            try:
+                return os.path.getmtime(os.path.join(self.dir, name))
+            except OSError:
+                return 0.0
+
+        total = sum(self.sizes.values())
+        for name in sorted(self.sizes, key=mtime):
+            if total <= self.max_bytes:
+                break
+            total -= self.sizes[name]
+            self.drop(name)
+            self.evicted += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "dir": self.dir,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+                "entries": len(self.sizes),
+                "bytes": sum(self.sizes.values()),
+            }
+
+
+# SUBPROCESS ISOLATION
+
+class ScrapeWorkerError(RuntimeError):
+    pass
+
+
+def _scrape_worker_main(conn: Any, max_result_bytes: int) -> None:
+    while True:
+        try:
+            kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+        if kwargs is None:
+            return
+
+        try:
+            df = call_scrape_jobs(kwargs)
+            payload = pickle.dumps(("ok", df), protocol=pickle.HIGHEST_PROTOCOL)
+            if max_result_bytes and len(payload) > max_result_bytes:
+                payload = pickle.dumps(("error", "OversizedResult", f"{len(payload)} bytes > {max_result_bytes}"))
+        except Exception as e:
+            payload = pickle.dumps(("error", type(e).__name__, str(e)))
+        conn.send_bytes(payload)
+
+
+class ScrapeProcess:
+    def __init__(self, ctx: Any, max_result_bytes: int) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=_scrape_worker_main, args=(child_conn, max_result_bytes), daemon=True)
+        self.proc.start()
+        child_conn.close()
+
+    def alive(self) -> bool:
+        return self.proc.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.proc.terminate()
+            self.proc.join(5)
+            if self.proc.is_alive():
+                self.proc.kill()
+                self.proc.join(5)
+        finally:
+            self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.proc.join(5)
+        except Exception:
+            pass
+        if self.proc.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ScrapeProcessPool:
+    """Reusable subprocesses for jobspy calls; a call past its deadline is killed and raises TimeoutError."""
+
+    def __init__(self, cfg: Config, size: int) -> None:
+        self.timeout = float(cfg.search_timeout_seconds)
+        self.max_result_bytes = int(cfg.max_result_bytes)
+        self.ctx = multiprocessing.get_context("spawn")
+        self.slots: "queue.Queue[Optional[ScrapeProcess]]" = queue.Queue()
+        self.killed = 0
+        self.lock = threading.Lock()
+        for _ in range(max(1, size)):
+            self.slots.put(None)
+
+    def run(self, kwargs: Dict[str, Any]) -> pd.DataFrame:
+        proc = self.slots.get()
+        try:
+            if proc is None or not proc.alive():
+                proc = ScrapeProcess(self.ctx, self.max_result_bytes)
+
+            proc.conn.send(kwargs)
+            if not proc.conn.poll(self.timeout):
+                proc.kill()
+                proc = None
+                with self.lock:
+                    self.killed += 1
+                raise TimeoutError(f"search exceeded {self.timeout:.0f}s deadline")
+
+            try:
+                result = pickle.loads(proc.conn.recv_bytes())
+            except (EOFError, OSError) as e:
+                proc.kill()
+                proc = None
+                raise ScrapeWorkerError(f"worker process died: {type(e).__name__}") from e
+        finally:
+            self.slots.put(proc)
+
+        if result[0] == "ok":
+            return result[1]
+        raise ScrapeWorkerError(f"{result[1]}: {result[2]}")
+
+    def close(self) -> None:
+        while True:
+            try:
+                proc = self.slots.get_nowait()
+            except queue.Empty:
+                return
+            if proc is not None:
+                proc.stop()
+
+
+# WORK QUEUE
+
+class LeaseQueue:
+    """SQLite task table through which a coordinator hands jobspy calls to --worker processes."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS tasks ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT, kwargs TEXT NOT NULL,"
+        " state TEXT NOT NULL DEFAULT 'queued', worker TEXT, lease_expires REAL,"
+        " attempts INTEGER NOT NULL DEFAULT 0, result BLOB)",
+        "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, id)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+
+    def __init__(self, cfg: Config, logger: logging.Logger, path: str, *, create: bool = False) -> None:
+        self.cfg = cfg
+        self.logger = logger
+        self.path = path
+        self.lock = threading.Lock()
+        self.requeued = 0
+        self.expired = 0
+        self.by_worker: Dict[str, int] = {}
+        if create:
+            with self.connect() as db:
+                for stmt in self.SCHEMA:
+                    db.execute(stmt)
+                db.execute("DELETE FROM tasks")
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '0')")
+
+    @contextlib.contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: sqlite3 connections are not shared across threads.
+        db = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # Results travel as JSON, never pickle: whoever can write the queue file must not run code here.
+    @staticmethod
+    def encode_result(result: Tuple[Any, ...]) -> bytes:
+        if result[0] == "ok":
+            return dumps_frame({"status": "ok", **frame_to_json(result[1])})
+        return dumps_frame({"status": "error", "type": result[1], "message": result[2]})
+
+    @staticmethod
+    def decode_result(payload: bytes) -> pd.DataFrame:
+        body = loads_frame(payload)
+        if body.get("status") == "ok":
+            return frame_from_json(body)
+        raise ScrapeWorkerError(f"{body.get('type')}: {body.get('message')}")
+
+    def requeue_expired(self, db: sqlite3.Connection) -> None:
+        cur = db.execute(
+            "UPDATE tasks SET state = 'queued', worker = NULL, attempts = attempts + 1 "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (time.time(),),
+        )
+        if cur.rowcount:
+            self.logger.warning(f"[LEASE_EXPIRED] re-queued {cur.rowcount} searches")
+
+    # Coordinator side
+
+    def run(self, kwargs: Dict[str, Any]) -> pd.DataFrame:
+        with self.connect() as db:
+            task_id = db.execute("INSERT INTO tasks (kwargs) VALUES (?)", (json.dumps(kwargs),)).lastrowid
+
+        while True:
+            time.sleep(self.cfg.queue_poll_seconds)
+            with self.connect() as db:
+                self.requeue_expired(db)
+                row = db.execute("SELECT state, worker, attempts, result FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                if row[0] == "queued" and row[2] >= self.cfg.lease_max_attempts:
+                    db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                    with self.lock:
+                        self.expired += 1
+                        self.requeued += row[2]
+                    raise TimeoutError(f"lease expired {row[2]} times")
+                if row[0] != "done":
+                    continue
+                db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+            with self.lock:
+                self.by_worker[row[1]] = self.by_worker.get(row[1], 0) + 1
+                self.requeued += row[2]
+            return self.decode_result(row[3])
+
+    def close(self) -> None:
+        with self.connect() as db:
+            db.execute("UPDATE meta SET value = '1' WHERE key = 'closed'")
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "db": self.path,
+                "requeued_leases": self.requeued,
+                "expired_searches": self.expired,
+                "searches_by_worker": dict(sorted(self.by_worker.items())),
+            }
+
+    # Worker side
+
+    def lease(self, worker: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        with self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            self.requeue_expired(db)
+            row = db.execute("SELECT id, kwargs FROM tasks WHERE state = 'queued' ORDER BY id LIMIT 1").fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ? WHERE id = ?",
+                    (worker, time.time() + self.cfg.lease_seconds, row[0]),
+                )
+        return (row[0], json.loads(row[1])) if row is not None else None
+
+    def heartbeat(self, task_ids: List[int], worker: str) -> None:
+        with self.connect() as db:
+            db.executemany(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                [(time.time() + self.cfg.lease_seconds, task_id, worker) for task_id in task_ids],
+            )
+
+    def complete(self, task_id: int, worker: str, result: Tuple[Any, ...]) -> bool:
+        payload = self.encode_result(result)
+        if self.cfg.max_result_bytes and len(payload) > self.cfg.max_result_bytes:
+            payload = self.encode_result(("error", "OversizedResult", f"{len(payload)} bytes > {self.cfg.max_result_bytes}"))
+        with self.connect() as db:
+            cur = db.execute(
+                "UPDATE tasks SET state = 'done', result = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (payload, task_id, worker),
+            )
+            return cur.rowcount == 1  # False when the lease expired and someone else took it
+
+    def closed(self) -> bool:
+        try:
+            with self.connect() as db:
+                row = db.execute("SELECT value FROM meta WHERE key = 'closed'").fetchone()
+        except sqlite3.OperationalError:
+            return False  # coordinator has not created the tables yet
+        return bool(row) and row[0] == "1"
+
+    def idle(self) -> bool:
+        with self.connect() as db:
+            return db.execute("SELECT COUNT(*) FROM tasks WHERE state = 'queued'").fetchone()[0] == 0
+
+
+def run_queue_worker(cfg: Config, logger: logging.Logger, path: str) -> None:
+    q = LeaseQueue(cfg, logger, path)
+    pool = ScrapeProcessPool(cfg, cfg.max_workers) if cfg.isolate_searches else None
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    held: Dict[int, str] = {}
+    held_lock = threading.Lock()
+    stop = threading.Event()
+    done = [0]
+
+    def beat() -> None:
+        while not stop.wait(max(1.0, cfg.lease_seconds / 3)):
+            with held_lock:
+                leases = dict(held)
+            for worker in set(leases.values()):
+                try:
+                    q.heartbeat([i for i, w in leases.items() if w == worker], worker)
+                except sqlite3.Error as e:
+                    logger.warning(f"[HEARTBEAT_FAIL] {type(e).__name__}: {e}")
+
+    def loop(worker: str) -> None:
+        while True:
+            try:
+                leased = q.lease(worker)
+            except sqlite3.Error as e:
+                logger.warning(f"[LEASE_FAIL] {worker}: {type(e).__name__}: {e}")
+                leased = None
+            if leased is None:
+                if q.closed() and q.idle():
+                    return
+                time.sleep(cfg.queue_poll_seconds)
+                continue
+
+            task_id, kwargs = leased
+            with held_lock:
+                held[task_id] = worker
+            try:
+                df = pool.run(kwargs) if pool is not None else call_scrape_jobs(kwargs)
+                result: Tuple[Any, ...] = ("ok", df if df is not None else pd.DataFrame())
+            except Exception as e:
+                result = ("error", type(e).__name__, str(e))
+            with held_lock:
+                held.pop(task_id, None)
+            if q.complete(task_id, worker, result):
+                with held_lock:
+                    done[0] += 1
+            else:
+                logger.warning(f"[LEASE_LOST] {worker} task={task_id}")
+
+    logger.info(f"[WORKER] {host} threads={cfg.max_workers} queue={path}")
+    heartbeat = threading.Thread(target=beat, name="lease-heartbeat", daemon=True)
+    heartbeat.start()
+    threads = [
+        threading.Thread(target=loop, args=(f"{host}:{i}",), name=f"queue-worker-{i}", daemon=True)
+        for i in range(max(1, cfg.max_workers))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    if pool is not None:
+        pool.close()
+    logger.info(f"[WORKER] {host} finished {done[0]} searches")
+
+
+# ERROR HANDLING
+
+RATE_LIMIT_ERR_RE = re.compile(r"\b(429|403|too many requests|rate[- ]?limit|throttl\w*|forbidden|blocked|captcha)\b", re.IGNORECASE)
+PERMANENT_ERR_RE = re.compile(
+    r"\b(400|404|invalid country|not (?:a )?valid|not supported|unsupported|OversizedResult|"
+    r"ValueError|TypeError|KeyError|AttributeError)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_error(err: str) -> str:
+    """Bucket a "Type: message" error string as rate_limit, permanent or transient."""
+    if RATE_LIMIT_ERR_RE.search(err or ""):
+        return "rate_limit"
+    if PERMANENT_ERR_RE.search(err or ""):
+        return "permanent"
+    return "transient"
+
+
+class CircuitBreaker:
+    """Per-country breaker: opens after consecutive failures, then lets one half-open probe through per cooldown."""
+
+    def __init__(self, cfg: Config, logger: logging.Logger, country: str) -> None:
+        self.cfg = cfg
+        self.logger = logger
+        self.country = country
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_owner: Optional[int] = None
+        self.trips: List[Dict[str, Any]] = []
+        self.deferred = 0
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cfg.breaker_cooldown_seconds:
+                self.state = "half_open"
+                self.probe_in_flight = False
+            if self.state == "half_open" and not self.probe_in_flight:
+                self.probe_in_flight = True
+                self.probe_owner = threading.get_ident()
+                self.logger.info(f"[BREAKER_PROBE] country='{self.country}'")
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        # The probe search ended without a verdict (permanent error, exception):
+        # let the next search probe instead of deferring everything behind it.
+        with self.lock:
+            if self.probe_in_flight and self.probe_owner == threading.get_ident():
+                self.probe_in_flight = False
+                self.probe_owner = None
+
+    def is_open(self) -> bool:
+        with self.lock:
+            return self.state == "open"
+
+    def exhausted(self) -> bool:
+        with self.lock:
+            return self.state != "closed" and len(self.trips) >= self.cfg.breaker_max_trips
+
+    def retry_in(self) -> float:
+        with self.lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.cfg.breaker_cooldown_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        with self.lock:
+            if self.state != "closed":
+                self.logger.info(f"[BREAKER_CLOSED] country='{self.country}'")
+            self.state = "closed"
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self, err: str) -> None:
+        with self.lock:
+            self.failures += 1
+            probe_failed = self.state == "half_open"
+            if not probe_failed and (self.state != "closed" or self.failures < self.cfg.breaker_failure_threshold):
+                return
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+            self.trips.append({
+                "at": utc_now_iso(),
+                "consecutive_failures": self.failures,
+                "probe_failed": probe_failed,
+                "last_error": err,
+            })
+            self.logger.warning(
+                f"[BREAKER_OPEN] country='{self.country}' failures={self.failures} trips={len(self.trips)}: {err}"
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "state": self.state,
+                "trips": list(self.trips),
+                "deferred_searches": self.deferred,
+                "skipped_searches": self.skipped,
+            }
+
+
+def scrape_with_retries(
+    cfg: Config,
+    *,
+    search_term: str,
+    country_indeed: str,
+    location: str,
+    limiter: Optional[TokenBucket] = None,
+    expect_rows: bool = False,
+    pool: Optional[Any] = None,  # ScrapeProcessPool or LeaseQueue
+    breaker: Optional[CircuitBreaker] = None,
+    query: Optional[str] = None,
+    hours_old: Optional[int] = None,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    base_kwargs = build_scrape_kwargs(
+        cfg, search_term=search_term, country_indeed=country_indeed, location=location,
+        query=query, hours_old=hours_old,
+    )
+
+    # The caller has already paced the first attempt; retries wait on the shared limiter.
     last_err: Optional[str] = None
     for attempt in range(cfg.max_retries + 1):
+        if attempt and breaker is not None and breaker.is_open():
+            break  # another worker already tripped this country; stop burning retries
+        if attempt and limiter is not None:
+            limiter.acquire()
+        started = time.monotonic()
         try:
-            df = call_scrape_jobs(base_kwargs)
+            df = pool.run(base_kwargs) if pool is not None else call_scrape_jobs(base_kwargs)
             if df is None or df.empty:
+                if limiter is not None:
+                    limiter.record("empty_unexpected" if expect_rows else "empty", time.monotonic() - started)
                 return pd.DataFrame(), None
+            if limiter is not None:
+                limiter.record("ok", time.monotonic() - started)
             return df, None
         except Exception as e:
             last_err = f"{type(e).__name__}: {e}"
-            if attempt >= cfg.max_retries:
+            kind = classify_error(last_err)
+            if limiter is not None:
+                outcome = "timeout" if isinstance(e, TimeoutError) else kind
+                limiter.record(outcome, time.monotonic() - started)
+            if kind == "permanent" or attempt >= cfg.max_retries:
                 break
+            # Back off even when the pacer cut the shared rate: inside its cooldown
+            # window it does not cut again, and the burst would hand out a token at once.
             backoff = min(cfg.retry_max_seconds, cfg.retry_base_seconds * (2 ** attempt))
             time.sleep(backoff + random.random())
 
@@ -609,7 +1560,7 @@ def enrich_common_fields(job: Dict[str, Any]) -> Dict[str, Any]:
     location = job.get("location") or ""
     country = job.get("search_country_indeed") or ""
 
-    wa = infer_work_arrangement(title, location, desc)
+    wa, employment_types = classify_job(title, location, desc, job.get("job_type"))
     job["work_arrangement"] = wa
 
     if wa == "remote":
@@ -619,7 +1570,7 @@ def enrich_common_fields(job: Dict[str, Any]) -> Dict[str, Any]:
     else:
         job["is_remote"] = job["is_remote"] if isinstance(job.get("is_remote"), bool) else None
 
-    job["employment_types"] = infer_employment_types(title, desc, job.get("job_type"))
+    job["employment_types"] = employment_types
 
     if any(job.get(k) is None for k in ("min_amount", "max_amount", "interval", "currency")):
         min_amt, max_amt, interval, currency = parse_salary_from_text(desc, country)
@@ -641,6 +1592,617 @@ def enrich_common_fields(job: Dict[str, Any]) -> Dict[str, Any]:
     return normalize_dict(job)
 
 
+ENRICHED_FIELDS = (
+    "work_arrangement", "is_remote", "employment_types",
+    "min_amount", "max_amount", "interval", "currency",
+    "location_city", "location_region", "location_country_hint",
+    "scraped_at", "posted_days_ago", "dedupe_key",
+)
+
+
+def salary_from_match(m: re.Match, country: str) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+    # Same conversions as parse_salary_from_text for a range or single-amount match.
+    single = "amount" in m.re.groupindex
+    cur_raw = (m.group("currency") or "").strip()
+    interval_raw = (m.group("interval") or "").strip().lower() if m.group("interval") else None
+    try:
+        min_val = float((m.group("amount" if single else "min") or "").replace(",", ""))
+        max_val = float((m.group("amount" if single else "max") or "").replace(",", ""))
+    except Exception:
+        return (None, None, None, None)
+    interval = INTERVAL_MAP.get(interval_raw, None) if interval_raw else None
+    return (min_val, max_val, interval, infer_currency(country, cur_raw))
+
+
+def parse_salary_fast(text: str, country: str) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+    # parse_salary_from_text, trying the patterns only where a currency token starts;
+    # the range pattern still wins over a single amount.
+    if not text:
+        return (None, None, None, None)
+    starts = [m.start() for m in SALARY_START_RE.finditer(text)]
+    m = match_at(SALARY_RANGE_RE, text, starts) or match_at(SALARY_SINGLE_RE, text, starts)
+    return salary_from_match(m, country) if m else (None, None, None, None)
+
+
+def match_at(pattern: re.Pattern, text: str, starts: List[int]) -> Optional[re.Match]:
+    # pattern.search(text) when every match must begin at one of starts.
+    for pos in starts:
+        m = pattern.match(text, pos)
+        if m:
+            return m
+    return None
+
+
+class EnrichmentMemo:
+    """Bounded LRU of text-derived enrichment, keyed by a digest of (title, description, job_type, country)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = int(size)
+        self.entries: "OrderedDict[bytes, List[Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(title: str, desc: str, job_type: str, country: str) -> bytes:
+        raw = "\x1f".join((title, desc, job_type, country)).encode("utf-8", errors="surrogatepass")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[List[Any]]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: bytes, entry: List[Any]) -> None:
+        if self.size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = entry
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def resize(self, size: int) -> None:
+        with self.lock:
+            self.size = int(size)
+            while len(self.entries) > max(0, self.size):
+                self.entries.popitem(last=False)
+
+
+ENRICH_MEMO = EnrichmentMemo(Config.enrich_memo_size)
+SALARY_NOT_PARSED = object()
+
+
+def configure_enrich_memo(size: int) -> None:
+    ENRICH_MEMO.resize(size)
+
+
+def enrich_frame(
+    df: pd.DataFrame,
+    scraped_at: Optional[str] = None,
+    memo_counts: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    """enrich_common_fields for a whole frame, column by column; memo_counts receives [hits, misses]."""
+    n = len(df)
+    if not n:
+        return []
+    cols: Dict[str, List[Any]] = {c: [norm(v) for v in df[c].tolist()] for c in df.columns}
+
+    def get(name: str) -> List[Any]:
+        return cols[name] if name in cols else [None] * n
+
+    def text(name: str) -> pd.Series:
+        return pd.Series([f"{v}" if v else "" for v in get(name)], dtype=object)
+
+    title, desc, location = text("title"), text("description"), text("location")
+    country = [v or "" for v in get("search_country_indeed")]
+
+    # Text-derived results come from the memo when the same posting text was seen before;
+    # otherwise each text column is scanned once and descriptions feed both classifications.
+    job_type = text("job_type")
+    salary = {k: get(k) for k in ("min_amount", "max_amount", "interval", "currency")}
+    need = [any(salary[k][i] is None for k in salary) for i in range(n)]
+    entries: List[List[Any]] = []
+    hits = 0
+    for i in range(n):
+        key = EnrichmentMemo.key(title[i], desc[i], job_type[i], country[i])
+        entry = ENRICH_MEMO.get(key)
+        if entry is None:
+            title_sig, desc_sig = text_signals(title[i]), text_signals(desc[i])
+            employment = employment_from_signals(
+                lowered_signals(title[i], title_sig) | lowered_signals(desc[i], desc_sig) | text_signals(job_type[i].lower())
+            )
+            entry = [title_sig | desc_sig, employment, SALARY_NOT_PARSED]
+            ENRICH_MEMO.put(key, entry)
+        else:
+            hits += 1
+        if need[i] and entry[2] is SALARY_NOT_PARSED:
+            entry[2] = parse_salary_fast(desc[i], country[i])
+        entries.append(entry)
+    if memo_counts is not None:
+        memo_counts[0] += hits
+        memo_counts[1] += n - hits
+
+    blank = ((title.str.strip() == "") & (location.str.strip() == "") & (desc.str.strip() == "")).to_numpy()
+    cols["work_arrangement"] = [
+        None if b else arrangement_from_signals(e[0] | text_signals(loc), loc)
+        for b, e, loc in zip(blank, entries, location)
+    ]
+    cols["is_remote"] = [
+        True if wa == "remote" else False if wa in ("hybrid", "onsite") else (v if isinstance(v, bool) else None)
+        for wa, v in zip(cols["work_arrangement"], get("is_remote"))
+    ]
+
+    cols["employment_types"] = [list(e[1]) if e[1] else None for e in entries]
+
+    # Salary text is only parsed where a field is missing.
+    if any(need):
+        for j, k in enumerate(("min_amount", "max_amount", "interval", "currency")):
+            values = list(salary[k])
+            for i in range(n):
+                if need[i] and values[i] is None:
+                    values[i] = entries[i][2][j]
+            cols[k] = values
+
+    parts = [split_location(v) for v in location.tolist()]
+    cols["location_city"] = [p["city"] for p in parts]
+    cols["location_region"] = [p["region"] for p in parts]
+    cols["location_country_hint"] = [p["country"] for p in parts]
+
+    now = scraped_at or utc_now_iso()
+    cols["scraped_at"] = [v or now for v in get("scraped_at")]
+
+    # Each distinct (date_posted, scraped_at) pair is parsed once.
+    days: Dict[Tuple[Any, str], Optional[int]] = {}
+    posted = get("date_posted")
+    for pair in zip(posted, cols["scraped_at"]):
+        if pair not in days:
+            days[pair] = posted_days_ago(*pair)
+    cols["posted_days_ago"] = [days[pair] for pair in zip(posted, cols["scraped_at"])]
+
+    cols["dedupe_key"] = dedupe_key_series(pd.DataFrame({f: get(f) for f in DEDUPE_KEY_FIELDS}, dtype=object)).tolist()
+
+    keys = list(df.columns) + [k for k in ENRICHED_FIELDS if k not in df.columns]
+    return [dict(zip(keys, values)) for values in zip(*(cols[k] for k in keys))]
+
+
+def enrich_batch(df: pd.DataFrame, scraped_at: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """enrich_frame plus its [memo hits, memo misses]."""
+    counts = [0, 0]
+    return enrich_frame(df, scraped_at, counts), counts
+
+
+class EnrichmentPool:
+    """Process offload for enrich_frame; the calling search thread waits for its own batch."""
+
+    def __init__(self, cfg: Config, logger: logging.Logger) -> None:
+        self.cfg = cfg
+        self.logger = logger
+        self.min_rows = int(cfg.enrich_min_batch_rows)
+        self.executor = self.start()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.inline_batches = 0
+        self.restarts = 0
+
+    def start(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, self.cfg.enrich_processes),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_enrich_memo,
+            initargs=(self.cfg.enrich_memo_size,),
+        )
+
+    def enrich(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[int]]:
+        if len(df) < self.min_rows:
+            with self.lock:
+                self.inline_batches += 1
+            return enrich_batch(df)
+
+        executor = self.executor
+        try:
+            rows, counts = executor.submit(enrich_batch, df, utc_now_iso()).result()
+        except concurrent.futures.process.BrokenProcessPool as e:
+            # A crashed child breaks the whole executor; replace it and do this batch here.
+            self.restart(executor, e)
+            with self.lock:
+                self.inline_batches += 1
+            return enrich_batch(df)
+        with self.lock:
+            self.batches += 1
+            self.rows += len(rows)
+        return rows, counts
+
+    def restart(self, broken: concurrent.futures.ProcessPoolExecutor, err: BaseException) -> None:
+        with self.lock:
+            if self.executor is not broken:
+                return  # another thread already replaced it
+            self.executor = self.start()
+            self.restarts += 1
+        self.logger.warning(f"[ENRICH_POOL_BROKEN] {type(err).__name__}: {err}; restarted the worker processes")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "inline_batches": self.inline_batches,
+                "restarts": self.restarts,
+            }
+
+
+# DEDUPE INDEX
+
+DEDUPE_INDEX_FILE = "dedupe_index.npz"  # under output_dir unless --dedupe-index-file
+
+
+def dedupe_key64(key: str) -> int:
+    """First 64 bits of a stable_dedupe_key digest."""
+    return int(key[:16], 16)
+
+
+class DedupeIndex:
+    """Every posting collected across groups (and runs, if persisted), as sorted 64-bit key prefixes."""
+
+    BLOOM_HASHES = 4
+    COMPACT_AT = 65536
+
+    def __init__(self, cfg: Config, logger: logging.Logger, path: Optional[str] = None) -> None:
+        self.logger = logger
+        self.path = path
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.owners = np.empty(0, dtype=np.uint16)
+        self.first_seen = np.empty(0, dtype=np.uint32)
+        self.pending: Dict[int, Tuple[int, int]] = {}
+        self.groups: List[str] = []
+        self.group_ids: Dict[str, int] = {}
+        self.bloom: Optional[np.ndarray] = None
+        self.bloom_bits = int(cfg.dedupe_bloom_bytes) * 8
+        self.run_started = int(time.time())
+        self.loaded = 0
+        self.lookups = 0
+        self.bloom_negatives = 0
+        self.other_group = 0
+        self.prior_run = 0
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+        if self.bloom_bits:
+            self.bloom = np.zeros(self.bloom_bits // 8, dtype=np.uint8)
+            self.bloom_add(self.keys)
+
+    def load(self, path: str) -> None:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keys, owners, first_seen = data["keys"], data["owners"], data["first_seen"]
+                groups = [str(g) for g in data["groups"]]
+        except Exception as e:
+            self.logger.warning(f"[DEDUPE_INDEX_SKIP] {path}: {type(e).__name__}: {e}")
+            return
+        self.keys = keys.astype(np.uint64)
+        self.owners = owners.astype(np.uint16)
+        self.first_seen = first_seen.astype(np.uint32)
+        self.groups = groups
+        self.group_ids = {g: i for i, g in enumerate(groups)}
+        self.loaded = len(self.keys)
+
+    def group_id(self, group: str) -> int:
+        gid = self.group_ids.get(group)
+        if gid is None:
+            gid = self.group_ids[group] = len(self.groups)
+            self.groups.append(group)
+        return gid
+
+    def bloom_positions(self, keys: np.ndarray) -> np.ndarray:
+        h1 = keys & np.uint64(0xFFFFFFFF)
+        h2 = (keys >> np.uint64(32)) | np.uint64(1)
+        rounds = np.arange(self.BLOOM_HASHES, dtype=np.uint64)[:, None]
+        return (h1[None, :] + rounds * h2[None, :]) % np.uint64(self.bloom_bits)
+
+    def bloom_add(self, keys: np.ndarray) -> None:
+        if self.bloom is None or not len(keys):
+            return
+        pos = self.bloom_positions(keys).ravel()
+        np.bitwise_or.at(self.bloom, (pos >> np.uint64(3)).astype(np.int64), (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+
+    def bloom_maybe(self, keys: np.ndarray) -> np.ndarray:
+        if self.bloom is None:
+            return np.ones(len(keys), dtype=bool)
+        pos = self.bloom_positions(keys)
+        bits = (self.bloom[(pos >> np.uint64(3)).astype(np.int64)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=0)
+
+    def compact(self) -> None:
+        # Caller holds self.lock.
+        if not self.pending:
+            return
+        keys = np.fromiter(self.pending.keys(), dtype=np.uint64, count=len(self.pending))
+        meta = np.array(list(self.pending.values()), dtype=np.int64).reshape(-1, 2)
+        keys = np.concatenate([self.keys, keys])
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.owners = np.concatenate([self.owners, meta[:, 0].astype(np.uint16)])[order]
+        self.first_seen = np.concatenate([self.first_seen, meta[:, 1].astype(np.uint32)])[order]
+        self.pending = {}
+
+    def observe(self, dedupe_keys: List[str], group: str, count: bool = True) -> List[Tuple[str, str, bool]]:
+        """(first_seen_group, first_seen_at, from_prior_run) per key; count=False seeds keys without tallying them."""
+        if not dedupe_keys:
+            return []
+        keys = np.array([dedupe_key64(k) for k in dedupe_keys], dtype=np.uint64)
+        now = int(time.time())
+        with self.lock:
+            gid = self.group_id(group)
+            maybe = self.bloom_maybe(keys)
+            found = np.zeros(len(keys), dtype=bool)
+            slots = np.zeros(len(keys), dtype=np.int64)
+            if len(self.keys) and maybe.any():
+                probe = np.flatnonzero(maybe)
+                idx = np.searchsorted(self.keys, keys[probe])
+                hit = idx < len(self.keys)
+                hit[hit] = self.keys[idx[hit]] == keys[probe][hit]
+                found[probe[hit]] = True
+                slots[probe[hit]] = idx[hit]
+
+            out: List[Tuple[str, str, bool]] = []
+            added: List[int] = []
+            for i, key in enumerate(keys.tolist()):
+                if found[i]:
+                    owner, seen_at = int(self.owners[slots[i]]), int(self.first_seen[slots[i]])
+                elif maybe[i] and key in self.pending:
+                    owner, seen_at = self.pending[key]
+                else:
+                    owner, seen_at = gid, now
+                    self.pending[key] = (gid, now)
+                    added.append(key)
+                prior = seen_at < self.run_started
+                if count and prior:
+                    self.prior_run += 1
+                elif count and owner != gid:
+                    self.other_group += 1
+                out.append((self.groups[owner], datetime.fromtimestamp(seen_at, timezone.utc).isoformat(), prior))
+
+            self.lookups += len(keys) if count else 0
+            self.bloom_negatives += int((~maybe).sum())
+            self.bloom_add(np.array(added, dtype=np.uint64))
+            if len(self.pending) >= self.COMPACT_AT:
+                self.compact()
+            return out
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self.lock:
+            self.compact()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp.npz"
+            np.savez(
+                tmp,
+                keys=self.keys,
+                owners=self.owners,
+                first_seen=self.first_seen,
+                groups=np.array(self.groups, dtype=str),
+            )
+            os.replace(tmp, self.path)
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            size = len(self.keys) + len(self.pending)
+            return {
+                "keys": size,
+                "loaded_keys": self.loaded,
+                "index_bytes": int(self.keys.nbytes + self.owners.nbytes + self.first_seen.nbytes),
+                "bloom_bytes": int(self.bloom.nbytes) if self.bloom is not None else 0,
+                "lookups": self.lookups,
+                "bloom_negatives": self.bloom_negatives,
+                "seen_other_group": self.other_group,
+                "seen_prior_run": self.prior_run,
+                "file": self.path,
+            }
+
+
+# NEAR DUPLICATES
+
+SHINGLE_TOKEN_RE = re.compile(r"[a-z0-9]+")
+NEAR_DUP_MIN_WORDS = 20  # shorter texts (e.g. title only) are never clustered
+
+
+def title_key(title: Any) -> str:
+    """Title words without case or accents; near-duplicates must share it."""
+    text = unicodedata.normalize("NFKD", str(norm(title) or "")).encode("ascii", "ignore").decode("ascii")
+    return " ".join(SHINGLE_TOKEN_RE.findall(text.lower()))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def word_hash64(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def text_simhash(title: Any, description: Any) -> Optional[int]:
+    """64-bit SimHash over word 3-shingles of title + description."""
+    words = SHINGLE_TOKEN_RE.findall(f"{norm(title) or ''} {norm(description) or ''}".lower())
+    if len(words) < NEAR_DUP_MIN_WORDS:
+        return None
+    # Hash each distinct word once, then combine and mix word triples as uint64 vectors.
+    w = np.fromiter(map(word_hash64, words), dtype=np.uint64, count=len(words))
+    with np.errstate(over="ignore"):
+        h = w[:-2] * np.uint64(0x9E3779B97F4A7C15) + w[1:-1] * np.uint64(0xC2B2AE3D27D4EB4F) + w[2:]
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xFF51AFD7ED558CCD)
+        h ^= h >> np.uint64(33)
+    hashes = np.unique(h)
+    votes = np.unpackbits(hashes.view(np.uint8)).reshape(-1, 64).sum(axis=0) * 2 > len(hashes)
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+class NearDuplicateIndex:
+    """SimHash clusters for one group found through LSH bands; callers hold the group lock."""
+
+    def __init__(self, max_distance: int) -> None:
+        self.max_distance = max(0, int(max_distance))
+        bands = min(64, self.max_distance + 1)
+        edges = [round(i * 64 / bands) for i in range(bands + 1)]
+        self.bands = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(edges, edges[1:])]
+        self.buckets: Dict[Tuple[int, int], List[Tuple[int, str, str]]] = {}
+
+    def nearest(self, sig: int, title: str) -> Optional[str]:
+        for band, (shift, mask) in enumerate(self.bands):
+            for other, other_title, cluster_id in self.buckets.get((band, (sig >> shift) & mask), ()):
+                if other_title == title and bin(sig ^ other).count("1") <= self.max_distance:
+                    return cluster_id
+        return None
+
+    def assign(
+        self, sig: Optional[int], title: str, dedupe_key: str, cluster_id: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """cluster_id for a posting and whether it joined an existing cluster; cluster_id is kept if given."""
+        if sig is None:
+            return cluster_id or dedupe_key[:16], False
+        found = None if cluster_id else self.nearest(sig, title)
+        cluster_id = found or cluster_id or dedupe_key[:16]
+        for band, (shift, mask) in enumerate(self.bands):
+            self.buckets.setdefault((band, (sig >> shift) & mask), []).append((sig, title, cluster_id))
+        return cluster_id, found is not None
+
+
+def collapse_near_duplicates(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One record per cluster_id: its first (newest) job with every member's location and dedupe_key folded in."""
+    out: List[Dict[str, Any]] = []
+    canonical: Dict[str, Dict[str, Any]] = {}
+    for job in jobs:
+        cluster_id = job.get("cluster_id")
+        if not cluster_id:
+            out.append(job)
+            continue
+        head = canonical.get(cluster_id)
+        if head is None:
+            head = canonical[cluster_id] = dict(job)
+            head["cluster_dedupe_keys"] = list(job.get("cluster_dedupe_keys") or [job.get("dedupe_key")])
+            head["cluster_locations"] = list(job.get("cluster_locations") or ([job["location"]] if job.get("location") else []))
+            out.append(head)
+            continue
+        for key in job.get("cluster_dedupe_keys") or [job.get("dedupe_key")]:
+            if key not in head["cluster_dedupe_keys"]:
+                head["cluster_dedupe_keys"].append(key)
+        for location in job.get("cluster_locations") or [job.get("location")]:
+            if location and location not in head["cluster_locations"]:
+                head["cluster_locations"].append(location)
+    for head in canonical.values():
+        head["cluster_size"] = len(head["cluster_dedupe_keys"])
+    return out
+
+
+# DESCRIPTION STORE
+
+DESCRIPTION_STORE_DIR = "descriptions"  # under output_dir unless --description-store-dir
+
+
+def description_store_dir(cfg: Config) -> str:
+    return cfg.description_store_dir or os.path.join(cfg.output_dir, DESCRIPTION_STORE_DIR)
+
+
+class DescriptionStore:
+    """Each distinct description once on disk, compressed and named by digest; records carry description_hash."""
+
+    SUFFIX = ".txt.z"
+
+    def __init__(self, path: str, logger: logging.Logger, fallback_dirs: Tuple[str, ...] = ()) -> None:
+        self.dir = path
+        self.fallback_dirs = tuple(d for d in fallback_dirs if d and d != path)
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.known: Set[str] = set()
+        self.stored = 0
+        self.reused = 0
+        self.bytes_written = 0
+        self.missing = 0
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def path_for(self, digest: str, root: Optional[str] = None) -> str:
+        return os.path.join(root or self.dir, digest[:2], digest + self.SUFFIX)
+
+    def put(self, text: str) -> str:
+        digest = self.digest(text)
+        with self.lock:
+            if digest in self.known:
+                self.reused += 1
+                return digest
+        path = self.path_for(digest)
+        written = 0
+        if not os.path.exists(path):
+            payload = zlib.compress(text.encode("utf-8"), 6)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+            written = len(payload)
+        with self.lock:
+            self.known.add(digest)
+            if written:
+                self.stored += 1
+                self.bytes_written += written
+            else:
+                self.reused += 1
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        for root in (self.dir,) + self.fallback_dirs:
+            try:
+                with open(self.path_for(digest, root), "rb") as f:
+                    return zlib.decompress(f.read()).decode("utf-8")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.logger.warning(f"[DESCRIPTION_SKIP] {digest}: {type(e).__name__}: {e}")
+                break
+        with self.lock:
+            self.missing += 1
+        return None
+
+    def dehydrate(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        # description -> description_hash in the same position, so field order is unchanged.
+        if "description" not in row:
+            return row
+        text = row["description"]
+        digest = self.put(text) if isinstance(text, str) and text else None
+        return {("description_hash" if k == "description" else k): (digest if k == "description" else v) for k, v in row.items()}
+
+    def rehydrate(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        texts: Dict[str, Optional[str]] = {}
+        out: List[Dict[str, Any]] = []
+        for job in jobs:
+            if "description_hash" not in job:
+                out.append(job)
+                continue
+            digest = job["description_hash"]
+            if digest and digest not in texts:
+                texts[digest] = self.get(digest)
+            text = texts.get(digest) if digest else None
+            if digest and text is None:
+                out.append(job)  # keep the reference rather than lose the text
+                continue
+            out.append({("description" if k == "description_hash" else k): (text if k == "description_hash" else v) for k, v in job.items()})
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "dir": self.dir,
+                "stored": self.stored,
+                "reused": self.reused,
+                "bytes_written": self.bytes_written,
+                "missing": self.missing,
+            }
+
+
 # GROUP PROCESSING
 
 @dataclass
@@ -652,6 +2214,49 @@ class GroupStats:
     dropped_company_mismatch: int = 0
     dropped_missing_anchor: int = 0
     errors: int = 0
+    errors_transient: int = 0
+    errors_rate_limit: int = 0
+    errors_permanent: int = 0
+    routed_out: int = 0
+    routed_in: int = 0
+    carried_over: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    enrich_memo_hits: int = 0
+    enrich_memo_misses: int = 0
+    seen_other_group: int = 0
+    seen_prior_run: int = 0
+    near_duplicates: int = 0
+    elapsed_seconds: float = 0.0
+    # Searches served from the cache; kept out of elapsed_seconds, which RunHistory reads as scrape time.
+    cache_seconds: float = 0.0
+    # stage -> {"rows_in", "rows_out", "seconds"}, in INGEST_STAGES order.
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+INGEST_STAGES = ("anchor", "company", "dedupe", "enrich", "near_dup", "store", "merge")
+
+
+def add_stage_totals(into: Dict[str, Dict[str, float]], stages: Dict[str, Dict[str, float]]) -> None:
+    for name, entry in stages.items():
+        total = into.setdefault(name, {"rows_in": 0, "rows_out": 0, "seconds": 0.0})
+        total["rows_in"] += int(entry.get("rows_in", 0) or 0)
+        total["rows_out"] += int(entry.get("rows_out", 0) or 0)
+        total["seconds"] = round(total["seconds"] + float(entry.get("seconds", 0.0) or 0.0), 4)
+
+
+class StageClock:
+    """Times consecutive ingest stages; each lap runs from the previous one."""
+
+    def __init__(self) -> None:
+        self.laps: Dict[str, Dict[str, float]] = {}
+        self.last = time.perf_counter()
+
+    def lap(self, name: str, rows_in: int, rows_out: int) -> int:
+        now = time.perf_counter()
+        self.laps[name] = {"rows_in": int(rows_in), "rows_out": int(rows_out), "seconds": now - self.last}
+        self.last = now
+        return int(rows_out)
 
 
 def sort_jobs_newest_first(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -664,11 +2269,20 @@ def sort_jobs_newest_first(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return sorted(jobs, key=key, reverse=True)
 
 
-def save_group(cfg: Config, logger: logging.Logger, company_group: str, jobs: List[Dict[str, Any]], stats: GroupStats) -> Dict[str, Any]:
+def save_group(
+    cfg: Config,
+    logger: logging.Logger,
+    company_group: str,
+    jobs: List[Dict[str, Any]],
+    stats: GroupStats,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     os.makedirs(cfg.output_dir, exist_ok=True)
     path = os.path.join(cfg.output_dir, f"{safe_filename(company_group)}.json")
 
     jobs_sorted = sort_jobs_newest_first(jobs)
+    if cfg.collapse_near_duplicates:
+        jobs_sorted = collapse_near_duplicates(jobs_sorted)
     atomic_write_json(path, jobs_sorted)
 
     summary = {
@@ -678,17 +2292,47 @@ def save_group(cfg: Config, logger: logging.Logger, company_group: str, jobs: Li
         "output_file": path,
         "stats": asdict(stats),
     }
+    if extra:
+        summary.update(extra)
 
     logger.info(f"[SAVED] {company_group}: {len(jobs_sorted)} -> {path}")
     return summary
 
 
-def save_overall_summary(cfg: Config, logger: logging.Logger, group_summaries: List[Dict[str, Any]]) -> None:
+def load_group_file(
+    cfg: Config, logger: logging.Logger, company_group: str, rehydrate: bool = False,
+) -> List[Dict[str, Any]]:
+    """Saved jobs for one group; rehydrate=True puts stored descriptions back in place of description_hash."""
+    path = os.path.join(cfg.output_dir, f"{safe_filename(company_group)}.json")
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"[LOAD_FAIL] {path}: {type(e).__name__}: {e}")
+        return []
+    if not isinstance(data, list):
+        return []
+    if rehydrate and any("description_hash" in job for job in data):
+        fallback = (os.path.join(cfg.output_dir, DESCRIPTION_STORE_DIR),)
+        data = DescriptionStore(description_store_dir(cfg), logger, fallback).rehydrate(data)
+    return data
+
+
+def save_overall_summary(
+    cfg: Config,
+    logger: logging.Logger,
+    group_summaries: List[Dict[str, Any]],
+    run_info: Optional[Dict[str, Any]] = None,
+) -> None:
     overall = {
         "scraped_at": datetime.now().isoformat(),
         "total_jobs_all_groups": sum(int(s.get("total_jobs", 0) or 0) for s in group_summaries),
         "company_groups": {s["company_group"]: s for s in group_summaries},
     }
+    if run_info:
+        overall["run"] = run_info
     path = os.path.join(cfg.output_dir, "summary.json")
     atomic_write_json(path, overall)
     logger.info(f"[SAVED] summary.json -> {path}")
@@ -708,145 +2352,1612 @@ def save_mismatch_examples(cfg: Config, logger: logging.Logger, mismatch_example
     logger.info(f"[SAVED] mismatch_examples.json -> {path}")
 
 
-def scrape_company_group(
-    cfg: Config,
-    logger: logging.Logger,
-    company_group: str,
-    aliases: List[str],
-    countries: List[str],
-) -> Tuple[List[Dict[str, Any]], GroupStats, Optional[Dict[str, Any]]]:
-    stats = GroupStats()
-    seen: Set[str] = set()
-    jobs: List[Dict[str, Any]] = []
-    mismatch_example: Optional[Dict[str, Any]] = None
-    search_terms = list(dict.fromkeys([a.strip() for a in aliases if a and a.strip()]))
-    allowed_company_lc = make_allowed_company_set(search_terms)
-    cap_threshold = max(1, min(int(cfg.results_wanted), 1000) - 1)
-
-    def ingest_df(df: pd.DataFrame, *, search_term: str, country: str, search_location: str) -> None:
-        nonlocal jobs, stats, seen, mismatch_example
+class GroupAggregator:
+    """Collects rows for one company group while its searches run on any worker."""
+
+    def __init__(self, cfg: Config, company_group: str, aliases: List[str]) -> None:
+        self.cfg = cfg
+        self.company_group = company_group
+        self.search_terms = list(dict.fromkeys([a.strip() for a in aliases if a and a.strip()]))
+        self.allowed_company_lc = make_allowed_company_set(self.search_terms)
+        self.alias_by_company_lc = {a.lower(): a for a in self.search_terms}
+        self.stats = GroupStats()
+        self.seen: Set[str] = set()
+        self.claimed: Set[str] = set()
+        self.jobs: List[Dict[str, Any]] = []
+        self.mismatch_example: Optional[Dict[str, Any]] = None
+        self.cap_expansions: List[Dict[str, Any]] = []
+        self.skipped_searches: List[Dict[str, Any]] = []
+        self.pending = 0
+        self.saved = False
+        self.dirty_after_save = False
+        self.alias_index: Dict[str, str] = {}
+        self.peers: Dict[str, "GroupAggregator"] = {}
+        self.journal: Optional["RequestJournal"] = None
+        self.enrichment: Optional[EnrichmentPool] = None
+        self.dedupe_index: Optional[DedupeIndex] = None
+        self.descriptions: Optional[DescriptionStore] = None
+        self.clusters = NearDuplicateIndex(cfg.near_dup_max_distance) if cfg.near_duplicates or cfg.collapse_near_duplicates else None
+        self.lock = threading.Lock()
+
+    def connect(
+        self,
+        alias_index: Dict[str, str],
+        peers: Dict[str, "GroupAggregator"],
+        journal: Optional["RequestJournal"] = None,
+    ) -> None:
+        self.alias_index = alias_index
+        self.peers = peers
+        self.journal = journal
+
+    def matched_alias(self, company: Any, default: str) -> str:
+        return self.alias_by_company_lc.get(to_clean_lower(company) or "", default)
+
+    def route_owner(self, company: Any) -> Optional[str]:
+        if not self.cfg.route_mismatches:
+            return None
+        owner = self.alias_index.get(to_clean_lower(company) or "")
+        return owner if owner and owner != self.company_group and owner in self.peers else None
+
+    def prepare_frame(self, df: pd.DataFrame, terms: List[str], *, country: str, search_location: str) -> List[Dict[str, Any]]:
+        kept = df.reindex(columns=list(COMMON_FIELDS)).assign(
+            company_group=self.company_group,
+            company_search_term=terms,
+            search_country_indeed=country,
+            search_location=search_location,
+        )
+        rows, (hits, misses) = self.enrichment.enrich(kept) if self.enrichment is not None else enrich_batch(kept)
+        with self.lock:
+            self.stats.enrich_memo_hits += hits
+            self.stats.enrich_memo_misses += misses
+        return rows
+
+    def signatures(self, rows: List[Dict[str, Any]]) -> Optional[List[Optional[int]]]:
+        if self.clusters is None:
+            return None
+        return [text_simhash(r.get("title"), r.get("description")) for r in rows]
+
+    def store_descriptions(self, rows: List[Dict[str, Any]], clock: StageClock) -> List[Dict[str, Any]]:
+        # Collected rows hold only description_hash, so running groups do not keep the text in memory.
+        if self.descriptions is None:
+            return rows
+        rows = [self.descriptions.dehydrate(r) for r in rows]
+        clock.lap("store", len(rows), len(rows))
+        return rows
+
+    def description_of(self, job: Dict[str, Any]) -> Any:
+        if "description_hash" in job:
+            digest = job["description_hash"]
+            return self.descriptions.get(digest) if digest and self.descriptions is not None else None
+        return job.get("description")
+
+    def merge_rows(self, enriched_rows: List[Dict[str, Any]], signatures: Optional[List[Optional[int]]] = None) -> int:
+        # Caller holds self.lock.
+        new_jobs: List[Dict[str, Any]] = []
+        for i, enriched in enumerate(enriched_rows):
+            key = enriched.get("dedupe_key")
+            self.claimed.discard(key)
+            if key in self.seen:
+                self.stats.deduped += 1
+                continue
+            self.seen.add(key)
+
+            if self.clusters is not None and signatures is not None:
+                enriched["cluster_id"], joined = self.clusters.assign(signatures[i], title_key(enriched.get("title")), key)
+                self.stats.near_duplicates += int(joined)
+            self.jobs.append(enriched)
+            self.stats.added += 1
+            new_jobs.append(enriched)
+        if new_jobs and self.dedupe_index is not None:
+            flags = self.dedupe_index.observe([j["dedupe_key"] for j in new_jobs], self.company_group)
+            for job, (first_group, first_at, prior) in zip(new_jobs, flags):
+                job["first_seen_group"] = first_group
+                job["first_seen_at"] = first_at
+                if prior:
+                    self.stats.seen_prior_run += 1
+                elif first_group != self.company_group:
+                    self.stats.seen_other_group += 1
+        if new_jobs and self.journal is not None:
+            self.journal.record_jobs(self.company_group, new_jobs, self.stats)
+        if new_jobs and self.saved:
+            self.dirty_after_save = True
+        return len(new_jobs)
+
+    def claim_unseen(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+        """First occurrence of each dedupe_key not yet collected or claimed; merge_rows or release_claims settles it."""
+        keys = dedupe_key_series(df)
+        with self.lock:
+            taken = keys.map(lambda k: k in self.seen or k in self.claimed).astype(bool)
+            mask = (~keys.duplicated() & ~taken).to_numpy()
+            claimed = keys[mask].tolist()
+            self.claimed.update(claimed)
+        return mask, claimed
+
+    def release_claims(self, keys: List[str]) -> None:
+        with self.lock:
+            self.claimed.difference_update(keys)
+
+    def prepare_claimed(
+        self, df: pd.DataFrame, terms: List[str], claimed: List[str], clock: StageClock, **where: str
+    ) -> Tuple[List[Dict[str, Any]], Optional[List[Optional[int]]]]:
+        """Enrich, sign and store claimed rows; the claims are released if any step fails."""
+        try:
+            rows = self.prepare_frame(df, terms, **where)
+            clock.lap("enrich", len(df), len(rows))
+            signatures = self.signatures(rows)
+            if signatures is not None:
+                clock.lap("near_dup", len(rows), len(rows))
+            return self.store_descriptions(rows, clock), signatures
+        except BaseException:
+            self.release_claims(claimed)
+            raise
+
+    def ingest_routed(self, df: pd.DataFrame, *, country: str, search_location: str) -> int:
+        clock = StageClock()
+        mask, claimed = self.claim_unseen(df)
+        fresh = df[mask]
+        clock.lap("dedupe", len(df), len(fresh))
+        terms = [self.matched_alias(c, c or "") for c in fresh["company"].tolist()]
+        enriched_rows, signatures = self.prepare_claimed(
+            fresh, terms, claimed, clock, country=country, search_location=search_location
+        )
+        with self.lock:
+            self.stats.routed_in += int(len(df))
+            self.stats.deduped += int(len(df)) - len(enriched_rows)
+            added = self.merge_rows(enriched_rows, signatures)
+            clock.lap("merge", len(enriched_rows), added)
+            add_stage_totals(self.stats.stages, clock.laps)
+            return added
+
+    def ingest_df(
+        self,
+        df: pd.DataFrame,
+        *,
+        search_term: str,
+        country: str,
+        search_location: str,
+        combined: bool = False,
+    ) -> Tuple[int, int]:
         if df is None or df.empty:
+            return 0, 0
+
+        def column(name: str) -> pd.Series:
+            return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+        # Stages run in order of cost: whole-column filters first, then the
+        # identity check against rows already collected, and only the
+        # survivors pay for enrichment. Each stage records rows in/out and time.
+        clock = StageClock()
+        rows_seen = int(len(df))
+        missing_anchor = (column("job_url").isna() & column("job_url_direct").isna() & column("id").isna()).to_numpy()
+        anchored = clock.lap("anchor", rows_seen, rows_seen - int(missing_anchor.sum()))
+
+        company_lc = clean_lower_series(column("company"))
+        if self.cfg.enforce_exact_company_match:
+            mismatch = ~missing_anchor & ~company_lc.isin(self.allowed_company_lc).to_numpy()
+        else:
+            mismatch = np.zeros(rows_seen, dtype=bool)
+        keep = ~missing_anchor & ~mismatch
+        dropped_missing_anchor = int(missing_anchor.sum())
+        dropped_company_mismatch = int(mismatch.sum())
+
+        # Rows already paid for go to the group that owns the company name.
+        owners = np.full(rows_seen, None, dtype=object)
+        if mismatch.any():
+            owners[mismatch] = company_lc[mismatch].map(self.route_owner).to_numpy()
+        routed_mask = mismatch & pd.notna(owners)
+        projected = df.reindex(columns=list(COMMON_FIELDS))
+        routed = {owner: projected[routed_mask & (owners == owner)] for owner in set(owners[routed_mask])}
+
+        example: Optional[Dict[str, Any]] = None
+        unrouted = np.flatnonzero(mismatch & ~routed_mask)
+        if len(unrouted) and self.mismatch_example is None:
+            example = df.iloc[[int(unrouted[0])]].to_dict("records")[0]
+            example.update({
+                "company_group": self.company_group,
+                "company_search_term": search_term,
+                "search_country_indeed": country,
+                "search_location": search_location,
+            })
+            example.pop("description", None)
+            example["allowed_company_names"] = sorted(self.search_terms)
+            example = normalize_dict(example)
+        matched = clock.lap("company", anchored, int(keep.sum()))
+
+        # Identity check before enrichment; merge_rows settles the claims under the lock.
+        fresh, claimed = self.claim_unseen(df[keep])
+        deduped_early = matched - int(fresh.sum())
+        survivors = projected[keep][fresh]
+        clock.lap("dedupe", matched, len(survivors))
+
+        if combined:
+            # A combined OR query records the alias the row actually matched.
+            terms = company_lc[keep][fresh].map(lambda c: self.alias_by_company_lc.get(c or "", search_term)).tolist()
+        else:
+            terms = [search_term] * len(survivors)
+        enriched_rows, signatures = self.prepare_claimed(
+            survivors, terms, claimed, clock, country=country, search_location=search_location
+        )
+
+        with self.lock:
+            self.stats.rows_seen += rows_seen
+            self.stats.dropped_missing_anchor += dropped_missing_anchor
+            self.stats.dropped_company_mismatch += dropped_company_mismatch
+            self.stats.routed_out += sum(len(v) for v in routed.values())
+            self.stats.deduped += deduped_early
+            if self.mismatch_example is None and example is not None:
+                self.mismatch_example = example
+
+            added = self.merge_rows(enriched_rows, signatures)
+            clock.lap("merge", len(enriched_rows), added)
+            add_stage_totals(self.stats.stages, clock.laps)
+
+        for owner, frame in routed.items():
+            self.peers[owner].ingest_routed(frame, country=country, search_location=search_location)
+
+        return matched, added
+
+    def carry_over(self, jobs: List[Dict[str, Any]]) -> int:
+        # Seed with the previous output so incremental rows merge by dedupe_key.
+        with self.lock:
+            carried = 0
+            for job in jobs:
+                key = job.get("dedupe_key")
+                if not key or key in self.seen:
+                    continue
+                self.seen.add(key)
+                # Members folded into a collapsed record are not new either.
+                self.seen.update(job.get("cluster_dedupe_keys") or [])
+                self.jobs.append(job)
+                carried += 1
+            self.stats.carried_over += carried
+            return carried
+
+    def seed_clusters(self) -> None:
+        # Restored and carried-over rows keep their cluster_id; new rows can join them.
+        if self.clusters is None:
             return
+        with self.lock:
+            for job in self.jobs:
+                sig = text_simhash(job.get("title"), self.description_of(job))
+                job["cluster_id"], _ = self.clusters.assign(
+                    sig, title_key(job.get("title")), job.get("dedupe_key") or "", job.get("cluster_id"),
+                )
 
-        df = df.copy()
-        df["company_group"] = company_group
-        df["company_search_term"] = search_term
-        df["search_country_indeed"] = country
-        df["search_location"] = search_location
+    def snapshot(self) -> Tuple[List[Dict[str, Any]], GroupStats]:
+        with self.lock:
+            return list(self.jobs), GroupStats(**asdict(self.stats))
+
+    def summary_extra(self) -> Dict[str, Any]:
+        with self.lock:
+            extra: Dict[str, Any] = {"cap_expansions": list(self.cap_expansions)}
+            if self.skipped_searches:
+                extra["partial"] = True
+                extra["skipped_searches"] = list(self.skipped_searches)
+            return extra
+
+
+# RUN HISTORY
+
+class RunHistory:
+    """Per-group cost taken from previous summary.json files."""
+
+    def __init__(self, summaries: List[Dict[str, Any]]) -> None:
+        self.group_stats: Dict[str, List[Dict[str, Any]]] = {}
+        self.capped: Dict[str, Set[Tuple[str, str]]] = {}
+        for summary in summaries:
+            for cg, entry in (summary.get("company_groups") or {}).items():
+                stats = entry.get("stats") if isinstance(entry, dict) else None
+                # A run served entirely from the search cache says nothing about scrape cost.
+                cache_only = isinstance(stats, dict) and not stats.get("requests") and bool(stats.get("cache_hits"))
+                if isinstance(stats, dict) and "requests" in stats and not cache_only:
+                    self.group_stats.setdefault(cg, []).append(stats)
+                for cap in (entry.get("cap_expansions") or []) if isinstance(entry, dict) else []:
+                    self.capped.setdefault(cg, set()).add((cap.get("search_term"), cap.get("country")))
+
+    @classmethod
+    def load(cls, paths: List[str], logger: logging.Logger) -> "RunHistory":
+        summaries: List[Dict[str, Any]] = []
+        for path in dict.fromkeys(paths):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    summaries.append(json.load(f))
+            except Exception as e:
+                logger.warning(f"[HISTORY_SKIP] {path}: {type(e).__name__}: {e}")
+        history = cls(summaries)
+        logger.info(f"[HISTORY] files={len(summaries)} groups_with_history={len(history.group_stats)}")
+        return history
+
+    def seconds_per_request(self, cfg: Config) -> float:
+        elapsed = requests = 0.0
+        for runs in self.group_stats.values():
+            for st in runs:
+                if float(st.get("elapsed_seconds") or 0) > 0:
+                    elapsed += float(st["elapsed_seconds"])
+                    requests += float(st.get("requests") or 0)
+        return elapsed / requests if requests > 0 else cfg.request_cost_prior_seconds
+
+    def group_cost(self, cfg: Config, company_group: str) -> float:
+        runs = self.group_stats.get(company_group)
+        if not runs:
+            return cfg.group_cost_prior_seconds
+
+        per_request = self.seconds_per_request(cfg)
+        costs: List[float] = []
+        for st in runs:
+            elapsed = float(st.get("elapsed_seconds") or 0)
+            if elapsed > 0:
+                # Searches served from the cache would each have been a request on a live run.
+                live, hits = float(st.get("requests") or 0), float(st.get("cache_hits") or 0)
+                costs.append(elapsed * (live + hits) / live if live > 0 else elapsed)
+                continue
+            # Older summaries have no timing; rows_seen breaks ties between equal request counts.
+            requests = float(st.get("requests") or 0)
+            rows_seen = float(st.get("rows_seen") or 0)
+            costs.append(requests * per_request + rows_seen * 1e-3)
+        return sum(costs) / len(costs)
+
+    def group_requests(self, company_group: str) -> Optional[float]:
+        runs = self.group_stats.get(company_group)
+        if not runs:
+            return None
+        return sum(float(st.get("requests") or 0) for st in runs) / len(runs)
+
+    def group_costs(self, cfg: Config, groups: List[str]) -> Dict[str, float]:
+        return {cg: self.group_cost(cfg, cg) for cg in groups}
+
+    def yield_per_request(self, company_group: Optional[str] = None) -> Optional[float]:
+        groups = [company_group] if company_group else list(self.group_stats)
+        added = requests = 0.0
+        for cg in groups:
+            for st in self.group_stats.get(cg, []):
+                added += float(st.get("added") or 0)
+                requests += float(st.get("requests") or 0) + float(st.get("cache_hits") or 0)
+        return added / requests if requests > 0 else None
+
+    def expected_seconds(self, cfg: Config, company_group: str) -> float:
+        elapsed = requests = 0.0
+        for st in self.group_stats.get(company_group, []):
+            if float(st.get("elapsed_seconds") or 0) > 0:
+                elapsed += float(st["elapsed_seconds"])
+                requests += float(st.get("requests") or 0)
+        if requests > 0:
+            return elapsed / requests
+        return self.seconds_per_request(cfg)
+
+    def search_cost(self, cfg: Config, task: "SearchTask") -> float:
+        # A search that hit the cap last time fans out to every city of its country.
+        requests = 1
+        if (task.search_term, task.country) in self.capped.get(task.company_group, set()):
+            requests += len(INDEED_CITY_LOCATIONS.get(task.country, []))
+        return requests * self.expected_seconds(cfg, task.company_group)
+
+    def expected_new_jobs(self, cfg: Config, task: "SearchTask") -> float:
+        # A country search that hit the cap last time returns a full page of rows again.
+        if task.level == "country" and (task.search_term, task.country) in self.capped.get(task.company_group, set()):
+            return float(min(int(cfg.results_wanted), 1000))
+        rate = self.yield_per_request(task.company_group)
+        if rate is None:
+            rate = self.yield_per_request()
+        return rate if rate is not None else 1.0
+
+
+YIELD_LEDGER_FILE = "yield_ledger.json"
+
+
+class YieldLedger:
+    """Per-search yield remembered across runs in <output_dir>/yield_ledger.json."""
+
+    def __init__(self, path: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = (data or {}).get("entries") or {}
+        self.current: Dict[str, Dict[str, List[int]]] = {}
+        self.skipped: Dict[str, Set[str]] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, logger: logging.Logger) -> "YieldLedger":
+        if not os.path.exists(path):
+            return cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(path, json.load(f))
+        except Exception as e:
+            logger.warning(f"[LEDGER_SKIP] {path}: {type(e).__name__}: {e}")
+            return cls(path)
 
-        for _, row in df.iterrows():
-            stats.rows_seen += 1
-            raw = row.to_dict()
+    def entry(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(kind, {}).get(key)
 
-            if is_missing(raw.get("job_url")) and is_missing(raw.get("job_url_direct")) and is_missing(raw.get("id")):
-                stats.dropped_missing_anchor += 1
-                continue
+    def mean_added(self, kind: str, key: str) -> Optional[float]:
+        e = self.entry(kind, key)
+        if not e or not e.get("runs"):
+            return None
+        return float(e.get("added") or 0) / float(e["runs"])
+
+    def should_prune(self, kind: str, key: str, after: int, probe_every: int, streak: str = "zero_streak") -> bool:
+        e = self.entry(kind, key)
+        if not e:
+            return False
+        return int(e.get(streak) or 0) >= after and int(e.get("skipped_runs") or 0) < probe_every
+
+    def record(self, kind: str, key: str, rows: int, added: int, matched: int = 0) -> None:
+        with self.lock:
+            acc = self.current.setdefault(kind, {}).setdefault(key, [0, 0, 0])
+            acc[0] += int(rows)
+            acc[1] += int(added)
+            acc[2] += int(matched)
+
+    def record_skip(self, kind: str, key: str) -> None:
+        with self.lock:
+            self.skipped.setdefault(kind, set()).add(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = utc_now_iso()
+        with self.lock:
+            merged: Dict[str, Dict[str, Dict[str, Any]]] = {k: {kk: dict(vv) for kk, vv in v.items()} for k, v in self.entries.items()}
+            for kind, keys in self.current.items():
+                for key, (rows, added, matched) in keys.items():
+                    e = merged.setdefault(kind, {}).setdefault(key, {"runs": 0, "rows": 0, "added": 0, "zero_streak": 0})
+                    e["runs"] = int(e.get("runs") or 0) + 1
+                    e["rows"] = int(e.get("rows") or 0) + rows
+                    e["added"] = int(e.get("added") or 0) + added
+                    e["matched"] = int(e.get("matched") or 0) + matched
+                    e["zero_streak"] = int(e.get("zero_streak") or 0) + 1 if added == 0 else 0
+                    e["zero_match_streak"] = int(e.get("zero_match_streak") or 0) + 1 if matched == 0 else 0
+                    e["last_added"] = added
+                    e["skipped_runs"] = 0
+                    e["last_searched_at"] = now
+            for kind, keys in self.skipped.items():
+                for key in keys:
+                    if key in self.current.get(kind, {}):
+                        continue
+                    e = merged.setdefault(kind, {}).setdefault(key, {"runs": 0, "rows": 0, "added": 0, "zero_streak": 0})
+                    e["skipped_runs"] = int(e.get("skipped_runs") or 0) + 1
+        return {"updated_at": now, "entries": merged}
+
+    def save(self) -> None:
+        atomic_write_json(self.path, self.snapshot())
+
+
+def predict_makespan(costs: List[float], workers: int) -> float:
+    # Longest-processing-time-first list scheduling onto the worker pool.
+    loads = [0.0] * max(1, workers)
+    for cost in sorted(costs, reverse=True):
+        i = loads.index(min(loads))
+        loads[i] += cost
+    return max(loads) if loads else 0.0
+
+
+# SCHEDULER
 
-            if cfg.enforce_exact_company_match and not company_exact_allowed(raw.get("company"), allowed_company_lc):
-                stats.dropped_company_mismatch += 1
+@dataclass
+class SearchOutcome:
+    rows: int = 0  # rows returned by jobspy
+    matched: int = 0  # rows that passed the anchor and company checks
+    added: int = 0  # matched rows that were new to the group
+    error: Optional[str] = None
+    cached_at: Optional[str] = None  # set when served from the search cache
+    searched_at: Optional[str] = None  # watermark time: request start, or cached_at for cache hits
 
-                if mismatch_example is None:
-                    example = dict(raw)
-                    example.pop("description", None)
-                    example["company_group"] = company_group
-                    example["company_search_term"] = search_term
-                    example["search_country_indeed"] = country
-                    example["search_location"] = search_location
-                    example["allowed_company_names"] = sorted(search_terms)
-                    mismatch_example = normalize_dict(example)
 
-                continue
+@dataclass
+class ExpansionState:
+    low_yield_streak: int = 0
+    cities_done: int = 0
+    stopped: bool = False
 
-            kept = keep_common_fields(raw)
 
-            kept["company_group"] = company_group
-            kept["company_search_term"] = search_term
-            kept["search_country_indeed"] = country
-            kept["search_location"] = search_location
+@dataclass
+class HeldWatermark:
+    """A capped search's watermark, held until the search and its whole expansion have finished."""
+    searched_at: Optional[str]
+    outstanding: int  # the search itself plus each child search
+    parent: Optional[str]
+    complete: bool = True
 
-            enriched = enrich_common_fields(kept)
 
-            key = enriched.get("dedupe_key")
-            if key in seen:
-                stats.deduped += 1
-                continue
-            seen.add(key)
+@dataclass(frozen=True)
+class SearchTask:
+    company_group: str
+    search_term: str
+    country: str
+    location: str
+    terms: Tuple[str, ...] = ()  # set when several aliases share one OR query
+    level: str = "country"  # country | region | city
+    region: Optional[str] = None  # province/state code for region and city searches
+    expansion: Optional[str] = None  # parent search a city belongs to, for early stopping
+    capped_parent: Optional[str] = None  # journal_key of the capped search this one expands
+
+    @property
+    def partition_key(self) -> str:
+        return f"{self.company_group}|{self.country}|{self.location}"
+
+    @property
+    def journal_key(self) -> str:
+        return f"{self.company_group}|{self.search_term}|{self.country}|{self.location}"
+
+    @property
+    def search_key(self) -> str:
+        # Shared by a country search and all of its region/city expansions.
+        return f"{self.company_group}|{self.search_term}|{self.country}"
+
+    @property
+    def query(self) -> str:
+        if self.terms:
+            return " OR ".join(f'"{t}"' for t in self.terms)
+        return f'"{self.search_term}"'
+
+
+def pack_alias_queries(aliases: List[str], max_length: int) -> List[List[str]]:
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    length = 0
+    for alias in aliases:
+        piece = len(alias) + 2 + (4 if current else 0)  # quotes, plus " OR " separator
+        if current and length + piece > max_length:
+            chunks.append(current)
+            current, length = [], 0
+            piece = len(alias) + 2
+        current.append(alias)
+        length += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def plan_group_searches(agg: GroupAggregator, countries: List[str]) -> List[SearchTask]:
+    if not agg.cfg.combine_aliases:
+        return [
+            SearchTask(agg.company_group, search_term, country, country)
+            for search_term in agg.search_terms
+            for country in countries
+        ]
+
+    tasks: List[SearchTask] = []
+    for chunk in pack_alias_queries(agg.search_terms, agg.cfg.max_query_length):
+        for country in countries:
+            if len(chunk) == 1:
+                tasks.append(SearchTask(agg.company_group, chunk[0], country, country))
+            else:
+                label = " OR ".join(f'"{t}"' for t in chunk)
+                tasks.append(SearchTask(agg.company_group, label, country, country, tuple(chunk)))
+    return tasks
 
-            jobs.append(enriched)
-            stats.added += 1
 
-    logger.info(f"[START] {company_group} (aliases={len(search_terms)} countries={len(countries)})")
+def apply_probe_schedule(
+    cfg: Config,
+    ledger: YieldLedger,
+    tasks: List[SearchTask],
+) -> Tuple[List[SearchTask], List[SearchTask], List[SearchTask]]:
+    """Split planned searches into (run, demoted, probes) using the yield ledger."""
+    if cfg.dead_search_after <= 0:
+        return tasks, [], []
+
+    run: List[SearchTask] = []
+    demoted: List[SearchTask] = []
+    probes: List[SearchTask] = []
+    for task in tasks:
+        e = ledger.entry("search", task.search_key)
+        dead = bool(e) and int(e.get("zero_match_streak") or 0) >= cfg.dead_search_after
+        if not dead:
+            run.append(task)
+        elif ledger.should_prune(
+            "search", task.search_key, cfg.dead_search_after, cfg.dead_search_probe_every, streak="zero_match_streak"
+        ):
+            demoted.append(task)
+        else:
+            probes.append(task)
+            run.append(task)
+    return run, demoted, probes
+
+
+def shard_tasks(
+    cfg: Config,
+    history: RunHistory,
+    planned: Dict[str, List[SearchTask]],
+) -> Tuple[Dict[str, List[SearchTask]], List[float], str]:
+    """This host's share of the plan, heaviest first onto the lightest shard, and a digest of the whole split."""
+    def order(task: SearchTask) -> Tuple[float, str]:
+        digest = hashlib.sha1(task.search_key.encode("utf-8")).hexdigest()
+        return (-round(history.search_cost(cfg, task), 6), digest)
+
+    loads = [0.0] * cfg.shard_count
+    mine: Dict[str, List[SearchTask]] = {cg: [] for cg in planned}
+    assignment: List[str] = []
+    everything = [t for tasks in planned.values() for t in tasks]
+    for task in sorted(everything, key=order):
+        shard = min(range(cfg.shard_count), key=lambda i: (loads[i], i))
+        loads[shard] += history.search_cost(cfg, task)
+        assignment.append(f"{task.journal_key}={shard}")
+        if shard == cfg.shard_index - 1:
+            mine[task.company_group].append(task)
+    digest = hashlib.sha1("\n".join(sorted(assignment)).encode("utf-8")).hexdigest()[:16]
+    return mine, loads, digest
+
+
+def city_region(city: str) -> Optional[str]:
+    parts = [p.strip() for p in city.split(",")]
+    return parts[-1].upper() if len(parts) > 1 else None
+
+
+def city_expansion_tasks(task: SearchTask) -> List[SearchTask]:
+    cities = INDEED_CITY_LOCATIONS.get(task.country, [])
+    cities = list(dict.fromkeys([c.strip() for c in cities if c and c.strip()]))
+    if task.level == "region":
+        cities = [c for c in cities if city_region(c) == task.region]
+    return [dataclasses.replace(task, location=city, level="city", region=city_region(city)) for city in cities]
+
+
+def region_expansion_tasks(task: SearchTask) -> List[SearchTask]:
+    names = INDEED_REGION_NAMES.get(task.country, {})
+    codes = dict.fromkeys(city_region(c) for c in INDEED_CITY_LOCATIONS.get(task.country, []))
+    return [
+        dataclasses.replace(task, location=names[code], level="region", region=code)
+        for code in codes
+        if code in names
+    ]
 
-    for search_term in search_terms:
-        for country in countries:
-            stats.requests += 1
-            df_country, err = scrape_with_retries(
-                cfg,
-                search_term=search_term,
-                country_indeed=country,
-                location=country,
-            )
-            if err:
-                stats.errors += 1
 
-            ingest_df(df_country, search_term=search_term, country=country, search_location=country)
+def run_cached_search(
+    cfg: Config,
+    agg: GroupAggregator,
+    task: SearchTask,
+    cache: SearchCache,
+    hours_old: Optional[int] = None,
+) -> Optional[SearchOutcome]:
+    """Serve a search from the cache; None on a miss. Sends no request, so the caller skips the limiter and breaker."""
+    started = time.monotonic()
+    kwargs = build_scrape_kwargs(
+        cfg, search_term=task.search_term, country_indeed=task.country, location=task.location,
+        query=task.query, hours_old=hours_old,
+    )
+    hit = cache.get(kwargs)
+    if hit is None:
+        return None
+    with agg.lock:
+        agg.stats.cache_hits += 1
+    df, cached_at = hit
+    matched, added = agg.ingest_df(
+        df,
+        search_term=task.search_term,
+        country=task.country,
+        search_location=task.location,
+        combined=bool(task.terms),
+    )
+    with agg.lock:
+        agg.stats.cache_seconds = round(agg.stats.cache_seconds + (time.monotonic() - started), 3)
+    return SearchOutcome(rows=int(len(df)), matched=matched, added=added, cached_at=cached_at)
 
-            country_rows = 0 if (df_country is None) else int(len(df_country))
-            looks_truncated = country_rows >= cap_threshold
 
-            if looks_truncated:
-                cities = INDEED_CITY_LOCATIONS.get(country, [])
-                cities = list(dict.fromkeys([c.strip() for c in cities if c and c.strip()]))
+def run_search_task(
+    cfg: Config,
+    logger: logging.Logger,
+    limiter: TokenBucket,
+    agg: GroupAggregator,
+    task: SearchTask,
+    expect_rows: bool = False,
+    pool: Optional[Any] = None,  # ScrapeProcessPool or LeaseQueue
+    breaker: Optional[CircuitBreaker] = None,
+    hours_old: Optional[int] = None,
+    cache: Optional[SearchCache] = None,  # fresh results are stored here; lookups go through run_cached_search
+) -> SearchOutcome:
+    started = time.monotonic()
+    if cache is not None:
+        cache.record_miss()
+        with agg.lock:
+            agg.stats.cache_misses += 1
+    limiter.acquire()
+    df, err = scrape_with_retries(
+        cfg,
+        search_term=task.search_term,
+        country_indeed=task.country,
+        location=task.location,
+        limiter=limiter,
+        expect_rows=expect_rows,
+        pool=pool,
+        breaker=breaker,
+        query=task.query,
+        hours_old=hours_old,
+    )
 
-                logger.info(
-                    f"[CAP_DETECTED] {company_group} term='{search_term}' country='{country}' "
-                    f"rows={country_rows} (>= {cap_threshold}); expanding to {len(cities)} cities"
-                )
+    if cache is not None and not err:
+        cache.put(build_scrape_kwargs(
+            cfg, search_term=task.search_term, country_indeed=task.country, location=task.location,
+            query=task.query, hours_old=hours_old,
+        ), df)
+
+    kind = classify_error(err) if err else None
+    if breaker is not None:
+        # A permanent error says nothing about whether the country is blocked.
+        if kind in ("transient", "rate_limit"):
+            breaker.record_failure(err or "")
+        elif kind is None:
+            breaker.record_success()
+
+    with agg.lock:
+        agg.stats.requests += 1
+        if err:
+            agg.stats.errors += 1
+            setattr(agg.stats, f"errors_{kind}", getattr(agg.stats, f"errors_{kind}") + 1)
+        checkpoint_due = agg.stats.requests % cfg.checkpoint_every_n_requests == 0
+
+    matched, added = agg.ingest_df(
+        df,
+        search_term=task.search_term,
+        country=task.country,
+        search_location=task.location,
+        combined=bool(task.terms),
+    )
+
+    with agg.lock:
+        agg.stats.elapsed_seconds = round(agg.stats.elapsed_seconds + (time.monotonic() - started), 3)
+
+    if checkpoint_due:
+        try:
+            jobs, stats = agg.snapshot()
+            save_group(cfg, logger, agg.company_group, jobs, stats, agg.summary_extra())
+        except Exception as e:
+            logger.error(f"[CHECKPOINT_FAIL] {agg.company_group}: {type(e).__name__}: {e}")
+
+    rows = 0 if (df is None) else int(len(df))
+    return SearchOutcome(rows=rows, matched=matched, added=added, error=err)
+
+
+# WATERMARKS
+
+WATERMARKS_FILE = "watermarks.json"
+
+
+class Watermarks:
+    """Last successful scrape time per (group, alias, country, location), for --incremental."""
+
+    def __init__(self, path: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.marks: Dict[str, str] = dict((data or {}).get("watermarks") or {})
+        self.lock = threading.Lock()
 
-                for city in cities:
-                    stats.requests += 1
-                    df_city, err2 = scrape_with_retries(
-                        cfg,
-                        search_term=search_term,
-                        country_indeed=country,
-                        location=city,
+    @classmethod
+    def load(cls, path: str, logger: logging.Logger) -> "Watermarks":
+        if not os.path.exists(path):
+            return cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(path, json.load(f))
+        except Exception as e:
+            logger.warning(f"[WATERMARKS_SKIP] {path}: {type(e).__name__}: {e}")
+            return cls(path)
+
+    def hours_old(self, cfg: Config, key: str) -> Optional[int]:
+        with self.lock:
+            mark = self.marks.get(key)
+        if not mark:
+            return cfg.hours_old
+        try:
+            last = datetime.fromisoformat(mark)
+        except ValueError:
+            return cfg.hours_old
+        age_hours = (datetime.now(timezone.utc) - last).total_seconds() / 3600.0
+        hours = max(1, int(math.ceil(age_hours)) + int(cfg.watermark_overlap_hours))
+        return min(hours, cfg.hours_old) if cfg.hours_old else hours
+
+    def advance(self, key: str, searched_at: str) -> None:
+        with self.lock:
+            if searched_at > self.marks.get(key, ""):
+                self.marks[key] = searched_at
+
+    def save(self) -> None:
+        with self.lock:
+            payload = {"updated_at": utc_now_iso(), "watermarks": dict(self.marks)}
+        atomic_write_json(self.path, payload)
+
+
+# REQUEST JOURNAL
+
+JOURNAL_FILE = "journal.jsonl"
+
+
+class RequestJournal:
+    """Append-only log of finished searches, new jobs and group stats, replayed by --resume."""
+
+    def __init__(self, path: str, logger: logging.Logger, resume: bool = False) -> None:
+        self.path = path
+        self.logger = logger
+        self.completed: Dict[str, SearchOutcome] = {}
+        self.jobs_by_group: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats_by_group: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume and os.path.exists(path):
+            self.load()
+        self.f = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def load(self) -> None:
+        lines = bad = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    bad += 1  # torn final write from a crash
+                    continue
+                cg = entry.get("company_group")
+                if isinstance(entry.get("stats"), dict):
+                    self.stats_by_group[cg] = entry["stats"]  # the latest snapshot wins
+                if entry.get("type") == "jobs":
+                    self.jobs_by_group.setdefault(cg, []).extend(entry.get("jobs") or [])
+                elif entry.get("type") == "search":
+                    outcome = SearchOutcome(
+                        rows=int(entry.get("rows") or 0),
+                        matched=int(entry.get("matched") or 0),
+                        added=int(entry.get("added") or 0),
+                        error=entry.get("error"),
+                        searched_at=entry.get("searched_at") or entry.get("at"),
                     )
-                    if err2:
-                        stats.errors += 1
+                    if not outcome.error:
+                        self.completed[entry["key"]] = outcome
+        self.logger.info(
+            f"[RESUME] journal={self.path} entries={lines} unreadable={bad} finished_searches={len(self.completed)}"
+        )
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self.lock:
+            self.f.write(line + "\n")
+            self.f.flush()
+
+    @staticmethod
+    def unfinished(path: str) -> bool:
+        """True if path holds entries from a run that never marked itself finished."""
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 4096))
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+        if not any(line.strip() for line in lines):
+            return False
+        try:
+            return json.loads(lines[-1]).get("type") != "finished"
+        except ValueError:
+            return True
+
+    # Callers hold the group's lock, so each group's snapshots land in the order they were taken.
+
+    def record_jobs(self, company_group: str, jobs: List[Dict[str, Any]], stats: GroupStats) -> None:
+        self.write({"type": "jobs", "company_group": company_group, "jobs": jobs, "stats": asdict(stats)})
+
+    def record_search(self, task: SearchTask, outcome: SearchOutcome, stats: GroupStats) -> None:
+        self.write({
+            "type": "search",
+            "key": task.journal_key,
+            "company_group": task.company_group,
+            "search_term": task.search_term,
+            "country": task.country,
+            "location": task.location,
+            "rows": outcome.rows,
+            "matched": outcome.matched,
+            "added": outcome.added,
+            "error": outcome.error,
+            "searched_at": outcome.searched_at,
+            "at": utc_now_iso(),
+            "stats": asdict(stats),
+        })
+
+    def mark_finished(self) -> None:
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"type": "finished", "at": utc_now_iso()}) + "\n")
+
+    def restore(self, agg: GroupAggregator) -> int:
+        jobs = self.jobs_by_group.get(agg.company_group, [])
+        snapshot = self.stats_by_group.get(agg.company_group)
+        with agg.lock:
+            for job in jobs:
+                key = job.get("dedupe_key")
+                if key in agg.seen:
+                    continue
+                agg.seen.add(key)
+                agg.jobs.append(job)
+            if snapshot is not None:
+                # Every counter (deduped, memo hits, stage timings, ...) as it stood after the last entry.
+                known = {f.name for f in dataclasses.fields(GroupStats)}
+                agg.stats = GroupStats(**{k: v for k, v in snapshot.items() if k in known})
+        return len(jobs)
+
+    def close(self) -> None:
+        with self.lock:
+            self.f.close()
+
+
+class SearchScheduler:
+    """Runs every (group, alias, country, location) search from one shared queue."""
+
+    def __init__(
+        self,
+        cfg: Config,
+        logger: logging.Logger,
+        aggregators: Dict[str, GroupAggregator],
+        on_group_done: Callable[[GroupAggregator], None],
+        group_costs: Optional[Dict[str, float]] = None,
+        history: Optional[RunHistory] = None,
+        ledger: Optional[YieldLedger] = None,
+        journal: Optional[RequestJournal] = None,
+        watermarks: Optional[Watermarks] = None,
+    ) -> None:
+        self.cfg = cfg
+        self.logger = logger
+        self.aggregators = aggregators
+        self.on_group_done = on_group_done
+        self.group_costs = group_costs or {}
+        self.history = history or RunHistory([])
+        self.ledger = ledger or YieldLedger(os.path.join(cfg.output_dir, YIELD_LEDGER_FILE))
+        self.journal = journal
+        self.replayed = 0
+        self.watermarks = watermarks or Watermarks(os.path.join(cfg.output_dir, WATERMARKS_FILE))
+        self.deadline: Optional[float] = None
+        self.budget_logged = False
+        self.started: Optional[float] = None
+        self.limiter = make_rate_limiter(cfg)
+        self.pool: Optional[Any] = None
+        if cfg.queue_db:
+            self.pool = LeaseQueue(cfg, logger, cfg.queue_db, create=True)
+        elif cfg.isolate_searches:
+            self.pool = ScrapeProcessPool(cfg, cfg.max_workers)
+        self.cache = SearchCache(cfg, logger) if cfg.cache_ttl_seconds else None
+        self.enrichment = EnrichmentPool(cfg, logger) if cfg.enrich_processes > 0 else None
+        for agg in aggregators.values():
+            agg.enrichment = self.enrichment
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.expansions: Dict[str, ExpansionState] = {}
+        self.held_watermarks: Dict[str, HeldWatermark] = {}
+        self.state_lock = threading.Lock()
+        self.tasks: "queue.PriorityQueue[Tuple[Tuple[Any, ...], int, Optional[SearchTask]]]" = queue.PriorityQueue()
+        self.seq = 0
+        self.seq_lock = threading.Lock()
+
+    def task_priority(self, task: SearchTask) -> Tuple[Any, ...]:
+        if self.cfg.time_budget_seconds:
+            # Under a deadline, best expected new jobs per second first.
+            return (-self.expected_new_jobs(task) / max(self.expected_seconds(task), 1e-3),)
+        # Most expensive groups first so the heaviest work does not form the tail;
+        # within a group, partitions that yielded most in earlier runs go first.
+        return (-self.group_costs.get(task.company_group, 0.0), -(self.ledger.mean_added("partition", task.partition_key) or 0.0))
+
+    def expected_new_jobs(self, task: SearchTask) -> float:
+        if task.level != "country":
+            remembered = self.ledger.mean_added("partition", task.partition_key)
+            if remembered is not None:
+                return remembered
+        return self.history.expected_new_jobs(self.cfg, task)
+
+    def expand(self, task: SearchTask, rows: int, searched_at: Optional[str] = None) -> List[SearchTask]:
+        cap_threshold = max(1, min(int(self.cfg.results_wanted), 1000) - 1)
+        if task.level == "city" or rows < cap_threshold:
+            return []
+
+        if self.cfg.geo_partitioning and task.level == "country":
+            level, children = "region", region_expansion_tasks(task)
+        else:
+            level, children = "city", city_expansion_tasks(task)
+        children = [dataclasses.replace(c, capped_parent=task.journal_key) for c in children]
+        # The cap hid postings only the children will fetch; advancing now would
+        # make the next delta window skip them if the expansion is cut short.
+        with self.state_lock:
+            self.held_watermarks[task.journal_key] = HeldWatermark(searched_at, len(children) + 1, task.capped_parent)
+
+        agg = self.aggregators[task.company_group]
+        with agg.lock:
+            agg.cap_expansions.append({
+                "search_term": task.search_term,
+                "country": task.country,
+                "location": task.location,
+                "rows": rows,
+            })
+
+        if level == "city" and self.cfg.marginal_yield_patience > 0:
+            expansion_id = f"{task.company_group}|{task.search_term}|{task.country}|{task.location}"
+            with self.state_lock:
+                self.expansions[expansion_id] = ExpansionState()
+            children = [dataclasses.replace(c, expansion=expansion_id) for c in children]
+
+        pruned: List[SearchTask] = []
+        if self.cfg.geo_partitioning:
+            kept: List[SearchTask] = []
+            for child in children:
+                if self.ledger.should_prune(
+                    "partition", child.partition_key, self.cfg.partition_prune_after, self.cfg.partition_probe_every
+                ):
+                    pruned.append(child)
+                else:
+                    kept.append(child)
+            children = kept
+            for child in pruned:
+                self.ledger.record_skip("partition", child.partition_key)
+                self.skip(child, "zero_yield_partition")
+
+        self.logger.info(
+            f"[CAP_DETECTED] {task.company_group} term='{task.search_term}' location='{task.location}' "
+            f"rows={rows} (>= {cap_threshold}); expanding to {len(children)} {level} searches"
+            + (f" ({len(pruned)} pruned)" if pruned else "")
+        )
+        return children
 
-                    ingest_df(df_city, search_term=search_term, country=country, search_location=city)
+    def expects_rows(self, task: SearchTask) -> bool:
+        # A country search that filled a whole page last run should not come back empty.
+        return task.level == "country" and (task.search_term, task.country) in self.history.capped.get(task.company_group, set())
 
-                    if stats.requests % cfg.checkpoint_every_n_requests == 0:
-                        try:
-                            save_group(cfg, logger, company_group, jobs, stats)
-                        except Exception as e:
-                            logger.error(f"[CHECKPOINT_FAIL] {company_group}: {type(e).__name__}: {e}")
+    def expected_seconds(self, task: SearchTask) -> float:
+        return self.history.expected_seconds(self.cfg, task.company_group)
 
-                    safe_sleep(cfg)
-            else:
-                if stats.requests % cfg.checkpoint_every_n_requests == 0:
-                    try:
-                        save_group(cfg, logger, company_group, jobs, stats)
-                    except Exception as e:
-                        logger.error(f"[CHECKPOINT_FAIL] {company_group}: {type(e).__name__}: {e}")
+    def out_of_budget(self, task: SearchTask) -> Optional[str]:
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return "time_budget_spent"
+        if self.expected_seconds(task) > remaining:
+            return "insufficient_time_remaining"
+        return None
+
+    def settle_watermark(self, task: SearchTask, searched_at: Optional[str], ok: bool) -> None:
+        """Advance a finished search's watermark; a capped search's waits until its whole expansion completed."""
+        key, parent = task.journal_key, task.capped_parent
+        with self.state_lock:
+            while True:
+                held = self.held_watermarks.get(key)
+                if held is not None:
+                    held.outstanding -= 1
+                    held.complete = held.complete and ok
+                    if held.outstanding > 0:
+                        return
+                    del self.held_watermarks[key]
+                    searched_at, ok, parent = held.searched_at, held.complete, held.parent
+                if ok and searched_at:
+                    self.watermarks.advance(key, searched_at)
+                if parent is None:
+                    return
+                key, parent, searched_at = parent, None, None
+
+    def skip(self, task: SearchTask, reason: str) -> None:
+        self.settle_watermark(task, None, False)
+        if reason == "time_budget_spent" and not self.budget_logged:
+            self.budget_logged = True
+            self.logger.warning(f"[BUDGET_SPENT] {self.cfg.time_budget_seconds:.0f}s elapsed; skipping remaining searches")
+        agg = self.aggregators[task.company_group]
+        with agg.lock:
+            agg.skipped_searches.append({
+                "search_term": task.search_term,
+                "country": task.country,
+                "location": task.location,
+                "reason": reason,
+            })
+
+    def breaker(self, country: str) -> CircuitBreaker:
+        with self.state_lock:
+            if country not in self.breakers:
+                self.breakers[country] = CircuitBreaker(self.cfg, self.logger, country)
+            return self.breakers[country]
+
+    def breaker_summary(self) -> Dict[str, Any]:
+        with self.state_lock:
+            breakers = dict(self.breakers)
+        return {country: b.summary() for country, b in breakers.items() if b.trips}
+
+    def expansion_stopped(self, task: SearchTask) -> bool:
+        with self.state_lock:
+            state = self.expansions.get(task.expansion or "")
+            return bool(state and state.stopped)
+
+    def record_marginal_yield(self, task: SearchTask, added: int) -> None:
+        with self.state_lock:
+            state = self.expansions.get(task.expansion or "")
+            if state is None or state.stopped:
+                return
+            state.cities_done += 1
+            state.low_yield_streak = state.low_yield_streak + 1 if added < self.cfg.marginal_yield_threshold else 0
+            if state.low_yield_streak < self.cfg.marginal_yield_patience:
+                return
+            state.stopped = True
+        self.logger.info(
+            f"[EARLY_STOP] {task.company_group} term='{task.search_term}' country='{task.country}' "
+            f"after {state.cities_done} cities ({state.low_yield_streak} in a row below {self.cfg.marginal_yield_threshold} new)"
+        )
+
+    def early_stop_summary(self) -> Dict[str, Any]:
+        with self.state_lock:
+            stopped = sum(1 for st in self.expansions.values() if st.stopped)
+            tracked = len(self.expansions)
+        skipped = sum(
+            1 for agg in self.aggregators.values()
+            for sk in agg.skipped_searches if sk.get("reason") == "marginal_yield_stop"
+        )
+        return {"expansions_tracked": tracked, "expansions_stopped": stopped, "cities_skipped": skipped}
+
+    def submit(self, task: SearchTask, *, deferred: bool = False) -> None:
+        if not deferred:
+            agg = self.aggregators[task.company_group]
+            with agg.lock:
+                agg.pending += 1
+        with self.seq_lock:
+            self.seq += 1
+            seq = self.seq
+        # Deferred searches sort behind everything that can run now.
+        self.tasks.put(((1 if deferred else 0,) + self.task_priority(task), seq, task))
+
+    def defer_or_skip(self, task: SearchTask, breaker: CircuitBreaker) -> bool:
+        """Returns True when the task went back on the queue (still outstanding)."""
+        if self.cfg.breaker_skip_when_open or breaker.exhausted():
+            with breaker.lock:
+                breaker.skipped += 1
+            self.skip(task, "circuit_open")
+            return False
+
+        with breaker.lock:
+            breaker.deferred += 1
+        self.submit(task, deferred=True)
+        # Only deferred work is left when one comes back around; wait instead of spinning.
+        time.sleep(min(1.0, max(0.05, breaker.retry_in())))
+        return True
+
+    def finish(self, task: SearchTask) -> None:
+        agg = self.aggregators[task.company_group]
+        with agg.lock:
+            agg.pending -= 1
+            done = agg.pending == 0
+        if done:
+            self.logger.info(
+                f"[DONE] {agg.company_group}: jobs={len(agg.jobs)} requests={agg.stats.requests} errors={agg.stats.errors}"
+            )
+            try:
+                self.on_group_done(agg)
+            except Exception as e:
+                self.logger.error(f"[FAIL] {agg.company_group}: {type(e).__name__}: {e}")
+
+    def worker(self) -> None:
+        while True:
+            _, _, task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                return
+            requeued = False
+            probing: Optional[CircuitBreaker] = None
+            try:
+                finished = self.journal.completed.get(task.journal_key) if self.journal is not None else None
+                if finished is not None:
+                    # Done before the restart: reuse its outcome to rebuild expansions, no request.
+                    with self.state_lock:
+                        self.replayed += 1
+                    self.record_marginal_yield(task, finished.added)
+                    for child in self.expand(task, finished.rows, finished.searched_at):
+                        self.submit(child)
+                    self.settle_watermark(task, finished.searched_at, True)
+                    continue
+                reason = self.out_of_budget(task)
+                if reason:
+                    self.skip(task, reason)
+                    continue
+                if self.expansion_stopped(task):
+                    self.skip(task, "marginal_yield_stop")
+                    continue
+                hours_old = self.watermarks.hours_old(self.cfg, task.journal_key) if self.cfg.incremental else None
+                searched_at = utc_now_iso()
+                # Cache hits send no request, so they neither wait for nor consume a breaker probe.
+                outcome = None
+                if self.cache is not None:
+                    outcome = run_cached_search(self.cfg, self.aggregators[task.company_group], task, self.cache, hours_old)
+                if outcome is None:
+                    breaker = self.breaker(task.country)
+                    if not breaker.allow():
+                        requeued = self.defer_or_skip(task, breaker)
+                        continue
+                    probing = breaker
+                    outcome = run_search_task(
+                        self.cfg, self.logger, self.limiter, self.aggregators[task.company_group], task,
+                        # A delta window can legitimately be empty.
+                        expect_rows=self.expects_rows(task) and hours_old is None,
+                        pool=self.pool, breaker=breaker, hours_old=hours_old, cache=self.cache,
+                    )
+                outcome.searched_at = outcome.cached_at or searched_at
+                if not outcome.error:
+                    # A blocked or failing search is not evidence that the search is dead.
+                    self.ledger.record("partition", task.partition_key, outcome.rows, outcome.added, outcome.matched)
+                    self.ledger.record("search", task.search_key, outcome.rows, outcome.added, outcome.matched)
+                if self.journal is not None:
+                    agg = self.aggregators[task.company_group]
+                    with agg.lock:
+                        self.journal.record_search(task, outcome, agg.stats)
+                self.record_marginal_yield(task, outcome.added)
+                for child in self.expand(task, outcome.rows, outcome.searched_at):
+                    self.submit(child)
+                self.settle_watermark(task, outcome.searched_at, not outcome.error)
+            except Exception as e:
+                self.logger.error(
+                    f"[FAIL] {task.company_group} term='{task.search_term}' location='{task.location}': {type(e).__name__}: {e}"
+                )
+                agg = self.aggregators[task.company_group]
+                with agg.lock:
+                    agg.stats.errors += 1
+                self.settle_watermark(task, None, False)
+            finally:
+                if probing is not None:
+                    probing.release_probe()
+                if not requeued:
+                    self.finish(task)
+                self.tasks.task_done()
+
+    def run(self) -> None:
+        self.started = time.monotonic()
+        if self.cfg.time_budget_seconds:
+            self.deadline = self.started + float(self.cfg.time_budget_seconds)
+
+        threads = [
+            threading.Thread(target=self.worker, name=f"search-worker-{i}", daemon=True)
+            for i in range(max(1, self.cfg.max_workers))
+        ]
+        for t in threads:
+            t.start()
+
+        self.tasks.join()
+
+        for _ in threads:
+            self.tasks.put(((float("inf"),), 0, None))
+        for t in threads:
+            t.join()
+
+        if self.pool is not None:
+            self.pool.close()
+            if isinstance(self.pool, ScrapeProcessPool) and self.pool.killed:
+                self.logger.warning(f"[ISOLATION] killed {self.pool.killed} searches past their deadline")
+        if self.enrichment is not None:
+            self.enrichment.close()
+
+
+# BENCHMARKS
+
+def load_corpus_inputs(cfg: Config, logger: logging.Logger) -> List[Dict[str, Any]]:
+    """Saved jobs from cfg.output_dir turned back into pre-enrichment records."""
+    records: List[Dict[str, Any]] = []
+    for cg in COMPANY_GROUPS:
+        for job in load_group_file(cfg, logger, cg, rehydrate=True):
+            rec = keep_common_fields(job)
+            for k in ("company_group", "company_search_term", "search_country_indeed", "search_location", "scraped_at"):
+                rec[k] = job.get(k)
+            records.append(rec)
+    return records
+
+
+# Per-regex classifiers from before the single-pass scanner; --self-check holds
+# classify_job to them.
 
-                safe_sleep(cfg)
+def infer_work_arrangement(title: str, location: str, desc: str) -> Optional[str]:
+    text = f"{title}\n{location}\n{desc}".strip()
+    if not text:
+        return None
+    if HYBRID_RE.search(text):
+        return "hybrid"
+    if REMOTE_RE.search(text) or (location.strip().lower() == "remote"):
+        return "remote"
+    if ONSITE_RE.search(text):
+        return "onsite"
+    return None
 
-    logger.info(f"[DONE] {company_group}: jobs={len(jobs)} requests={stats.requests} errors={stats.errors}")
-    return jobs, stats, mismatch_example
+
+def infer_employment_types(title: str, desc: str, job_type_raw: Optional[str]) -> Optional[List[str]]:
+    text = f"{title}\n{desc}\n{job_type_raw or ''}".lower()
+    found: Set[str] = set()
+
+    if FULLTIME_RE.search(text): found.add("fulltime")
+    if PARTTIME_RE.search(text): found.add("parttime")
+    if CONTRACT_RE.search(text): found.add("contract")
+    if TEMP_RE.search(text): found.add("temporary")
+    if INTERN_RE.search(text): found.add("internship")
+
+    return sorted(found) if found else None
+
+
+def benchmark_classifier(cfg: Config, logger: logging.Logger, repeat: int = 3) -> None:
+    texts = [r.get("description") or "" for r in load_corpus_inputs(cfg, logger)]
+    if not texts:
+        logger.error(f"[BENCH] no saved jobs under {cfg.output_dir}")
+        return
+
+    def separate(text: str) -> Set[str]:
+        return {name for name, pattern in SIGNAL_PATTERNS if pattern.search(text)}
+
+    timings: Dict[str, float] = {}
+    results: Dict[str, List[Set[str]]] = {}
+    for label, fn in (("separate", separate), ("single_pass", text_signals)):
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            results[label] = [fn(t) for t in texts]
+            best = min(best, time.perf_counter() - started)
+        timings[label] = best
+
+    avg_kb = sum(len(t) for t in texts) / len(texts) / 1024
+    logger.info(
+        f"[BENCH] classifier descriptions={len(texts)} avg={avg_kb:.1f}KB "
+        f"separate={timings['separate'] / len(texts) * 1e6:.0f}us/desc "
+        f"single_pass={timings['single_pass'] / len(texts) * 1e6:.0f}us/desc "
+        f"speedup={timings['separate'] / timings['single_pass']:.2f}x "
+        f"identical={results['separate'] == results['single_pass']}"
+    )
+
+
+def benchmark_enrichment(cfg: Config, logger: logging.Logger, repeat: int = 3) -> None:
+    records = load_corpus_inputs(cfg, logger)
+    if not records:
+        logger.error(f"[BENCH] no saved jobs under {cfg.output_dir}")
+        return
+    df = pd.DataFrame(records, columns=list(records[0]))
+
+    def best(fn: Callable[[], Any], cold_memo: bool = False) -> Tuple[float, Any]:
+        times, out = [], None
+        for _ in range(max(1, repeat)):
+            if cold_memo:
+                configure_enrich_memo(0)
+                configure_enrich_memo(cfg.enrich_memo_size)
+            started = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - started)
+        return min(times), out
+
+    row_s, per_row = best(lambda: [enrich_common_fields(dict(r)) for r in records])
+    batch_s, batch = best(lambda: enrich_frame(df), cold_memo=True)
+    warm_s, _ = best(lambda: enrich_frame(df))
+    identical = json.dumps(per_row, default=str) == json.dumps(batch, default=str)
+    logger.info(
+        f"[BENCH] enrichment rows={len(records)} per_row={row_s:.3f}s batch={batch_s:.3f}s "
+        f"speedup={row_s / batch_s:.2f}x identical={identical} warm_memo={warm_s:.3f}s"
+    )
+
+
+def jobspy_like_frame(cfg: Config, logger: logging.Logger) -> pd.DataFrame:
+    # Saved jobs plus a few fixed rows, with date_posted as the date objects jobspy returns.
+    records = [
+        {"site": "indeed", "id": "check-1", "title": "Summer Intern (Hybrid)", "company": "RBC",
+         "location": "Toronto, ON, CA", "job_url": "https://example.com/1", "date_posted": date(2026, 10, 1),
+         "description": "Pay: $50,000 - $60,000 a year. 3 days in office.", "min_amount": float("nan"),
+         "is_remote": None, "search_country_indeed": "Canada"},
+        {"site": "indeed", "id": "check-2", "title": "İntern, Risk", "company": "TD",
+         "location": "Remote", "job_url": "https://example.com/2", "date_posted": None,
+         "description": None, "min_amount": 70000.0, "max_amount": 90000.0, "interval": "yearly",
+         "currency": "CAD", "is_remote": True, "search_country_indeed": "Canada"},
+    ]
+    for rec in load_corpus_inputs(cfg, logger):
+        try:
+            rec["date_posted"] = date.fromisoformat(str(rec.get("date_posted"))[:10])
+        except ValueError:
+            pass
+        records.append(rec)
+    return pd.DataFrame(records, columns=list(dict.fromkeys(k for r in records for k in r)))
+
+
+def self_check(cfg: Config, logger: logging.Logger) -> bool:
+    df = jobspy_like_frame(cfg, logger)
+    scraped_at = utc_now_iso()
+    configure_enrich_memo(0)  # every path below enriches from scratch
+    try:
+        inline = enrich_frame(df, scraped_at)
+        queued = enrich_frame(LeaseQueue.decode_result(LeaseQueue.encode_result(("ok", df))), scraped_at)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SearchCache(dataclasses.replace(cfg, cache_dir=tmp, cache_ttl_seconds=3600.0), logger)
+            cache.put({"search_term": "check"}, df)
+            hit = cache.get({"search_term": "check"})
+            cached = enrich_frame(hit[0], scraped_at) if hit else None
+    finally:
+        configure_enrich_memo(cfg.enrich_memo_size)
+    reference = [
+        (infer_work_arrangement(r["title"] or "", r["location"] or "", r["description"] or ""),
+         infer_employment_types(r["title"] or "", r["description"] or "", r["job_type"] or ""))
+        for r in (normalize_dict(r) for r in df.reindex(columns=["title", "location", "description", "job_type"]).to_dict("records"))
+    ]
+    # Characters re folds under IGNORECASE beyond ASCII case: "İ"/"ı" -> i, "ſ" -> s, Kelvin sign -> k.
+    salary_texts = [d for d in df["description"].tolist() if isinstance(d, str)] + [
+        "ſGD 5,000 - 6,000 per month", "HK\u212aD 300 / day", "eur 40/hr", "Pay: £1,200 per week, then € 50/hour",
+    ]
+    checks = {
+        "work_queue": queued == inline,
+        "search_cache": cached == inline,
+        "classifier": [(r["work_arrangement"], r["employment_types"]) for r in inline] == reference,
+        "salary": all(parse_salary_fast(t, "Canada") == parse_salary_from_text(t, "Canada") for t in salary_texts),
+    }
+    logger.info(f"[CHECK] rows={len(df)} " + " ".join(f"{k}_identical={v}" for k, v in checks.items()))
+    return all(checks.values())
+
+
+# SHARD MERGE
+
+def merge_shards(cfg: Config, logger: logging.Logger, shard_dirs: List[str]) -> None:
+    """Combine --shard outputs into one set of group files, summary.json and mismatch_examples.json."""
+    shard_summaries: List[Dict[str, Any]] = []
+    mismatch_examples: Dict[str, Dict[str, Any]] = {}
+    for d in shard_dirs:
+        summary: Dict[str, Any] = {}
+        try:
+            with open(os.path.join(d, "summary.json"), "r", encoding="utf-8") as f:
+                summary = json.load(f)
+        except Exception as e:
+            logger.warning(f"[MERGE_SKIP] {d}/summary.json: {type(e).__name__}: {e}")
+        shard_summaries.append(summary)
+        try:
+            with open(os.path.join(d, "mismatch_examples.json"), "r", encoding="utf-8") as f:
+                for cg, ex in (json.load(f).get("mismatch_examples") or {}).items():
+                    mismatch_examples.setdefault(cg, ex)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"[MERGE_SKIP] {d}/mismatch_examples.json: {type(e).__name__}: {e}")
+
+    groups = list(COMPANY_GROUPS)
+    for summary in shard_summaries:
+        groups.extend(cg for cg in (summary.get("company_groups") or {}) if cg not in groups)
+
+    stat_fields = [f.name for f in dataclasses.fields(GroupStats)]
+    descriptions = DescriptionStore(description_store_dir(cfg), logger) if cfg.description_store else None
+    group_summaries: List[Dict[str, Any]] = []
+    for cg in groups:
+        jobs: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        stats = GroupStats()
+        extra: Dict[str, Any] = {"cap_expansions": [], "merged_shards": 0, "cross_shard_duplicates": 0}
+        skipped: List[Dict[str, Any]] = []
+        for d, summary in zip(shard_dirs, shard_summaries):
+            entry = (summary.get("company_groups") or {}).get(cg)
+            shard_jobs = load_group_file(dataclasses.replace(cfg, output_dir=d), logger, cg, rehydrate=True)
+            if not entry and not shard_jobs:
+                continue
+            extra["merged_shards"] += 1
+            for job in shard_jobs:
+                key = job.get("dedupe_key") or stable_dedupe_key(job)
+                if key in seen:
+                    extra["cross_shard_duplicates"] += 1
+                    continue
+                seen.add(key)
+                jobs.append(job)
+            entry = entry or {}
+            for name in stat_fields:
+                value = (entry.get("stats") or {}).get(name)
+                if isinstance(value, (int, float)):
+                    setattr(stats, name, getattr(stats, name) + value)
+            add_stage_totals(stats.stages, (entry.get("stats") or {}).get("stages") or {})
+            extra["cap_expansions"].extend(entry.get("cap_expansions") or [])
+            skipped.extend(entry.get("skipped_searches") or [])
+        if not extra["merged_shards"]:
+            continue
+        stats.elapsed_seconds = round(stats.elapsed_seconds, 3)
+        stats.cache_seconds = round(stats.cache_seconds, 3)
+        if skipped:
+            extra["partial"] = True
+            extra["skipped_searches"] = skipped
+        if descriptions is not None:
+            jobs = [descriptions.dehydrate(j) for j in jobs]
+        group_summaries.append(save_group(cfg, logger, cg, jobs, stats, extra))
+
+    run_info = {
+        "merged_from": [
+            {"dir": d, "shard": (summary.get("run") or {}).get("shard"), "scraped_at": summary.get("scraped_at")}
+            for d, summary in zip(shard_dirs, shard_summaries)
+        ],
+    }
+    digests = {((s.get("run") or {}).get("shard") or {}).get("plan_digest") for s in shard_summaries}
+    if len(digests) > 1:
+        # Different histories gave different splits: some searches ran twice, others on no shard.
+        run_info["plan_mismatch"] = sorted(str(d) for d in digests)
+        logger.warning(
+            f"[MERGE_PLAN_MISMATCH] shards computed {len(digests)} different splits; "
+            "rerun them with the same --history file"
+        )
+    save_overall_summary(cfg, logger, group_summaries, run_info)
+    save_mismatch_examples(cfg, logger, mismatch_examples)
+    duplicates = sum(s.get("cross_shard_duplicates", 0) for s in group_summaries)
+    logger.info(f"[MERGE] shards={len(shard_dirs)} groups={len(group_summaries)} cross_shard_duplicates={duplicates}")
 
 
 # MAIN
 
+def parse_shard(value: str) -> Tuple[int, int]:
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not m or not 1 <= int(m.group(1)) <= int(m.group(2)):
+        raise argparse.ArgumentTypeError(f"invalid shard: {value!r} (e.g. 1/4, 1-based)")
+    return int(m.group(1)), int(m.group(2))
+
+
+def parse_duration(value: str) -> float:
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value or "", re.IGNORECASE)
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (e.g. 5400, 90m, 1.5h)")
+    return float(m.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[m.group(2).lower()]
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Clean Indeed scraper (JobSpy) with common fields only.")
     p.add_argument("--output-dir", default=None, help="Output directory for JSON files.")
     p.add_argument("--results-wanted", type=int, default=None, help="Max results per search.")
     p.add_argument("--hours-old", type=int, default=None, help="Filter to postings within N hours (e.g. 168).")
-    p.add_argument("--max-workers", type=int, default=None, help="Parallel company groups.")
+    p.add_argument("--incremental", action="store_true",
+                   help="Fetch only postings newer than each search's last successful run and merge into existing files.")
+    p.add_argument("--watermark-overlap-hours", type=int, default=None, help="Safety overlap added to each delta window.")
+    p.add_argument("--max-workers", type=int, default=None, help="Parallel search workers (shared across all groups).")
+    p.add_argument("--requests-per-second", type=float, default=None, help="Global request budget across all workers.")
+    p.add_argument("--no-adaptive-pacing", action="store_true", help="Keep the request rate fixed instead of AIMD pacing.")
+    p.add_argument("--breaker-skip", action="store_true", help="Skip (rather than defer) searches for a country whose breaker is open.")
+    p.add_argument("--marginal-yield-patience", type=int, default=None,
+                   help="Stop a city expansion after N cities in a row add fewer than --marginal-yield-threshold new jobs.")
+    p.add_argument("--marginal-yield-threshold", type=int, default=None, help="New jobs a city must add to count as productive.")
+    p.add_argument("--dead-search-after", type=int, default=None,
+                   help="Demote (alias, country) searches with zero matched rows for K runs to an occasional probe.")
+    p.add_argument("--resume", action="store_true",
+                   help="Continue an interrupted run from <output-dir>/journal.jsonl instead of starting over.")
+    p.add_argument("--fresh", action="store_true",
+                   help="Start over even though <output-dir>/journal.jsonl holds an interrupted run, discarding it.")
+    p.add_argument("--isolate-searches", action="store_true", help="Run each jobspy call in a subprocess with a hard deadline.")
+    p.add_argument("--search-timeout", type=float, default=None, help="Per-search deadline in seconds (with --isolate-searches).")
+    p.add_argument("--cache-ttl", type=parse_duration, default=None,
+                   help="Reuse identical searches cached on disk within this window (e.g. 6h).")
+    p.add_argument("--cache-dir", default=None, help="Search cache directory (defaults to <output-dir>/search_cache).")
+    p.add_argument("--cache-max-mb", type=float, default=None, help="Evict the oldest cached searches beyond this size.")
+    p.add_argument("--shard", type=parse_shard, default=None,
+                   help="Run only shard i of N (e.g. 2/4); requires --history, the same file(s) on every host.")
+    p.add_argument("--merge", nargs="+", default=None, metavar="SHARD_DIR",
+                   help="Merge the output dirs of a sharded run into --output-dir and exit.")
+    p.add_argument("--enrich-processes", type=int, default=None,
+                   help="Offload enrichment to N processes; each search thread waits for its own batch.")
+    p.add_argument("--enrich-memo-size", type=int, default=None,
+                   help="LRU entries of enrichment results reused for repeated posting text (0 disables).")
+    p.add_argument("--dedupe-index", action="store_true",
+                   help="Flag postings already collected by another group (first_seen_group / first_seen_at).")
+    p.add_argument("--persist-dedupe-index", action="store_true",
+                   help="Keep the dedupe index between runs so repeat postings are flagged too (implies --dedupe-index).")
+    p.add_argument("--dedupe-index-file", default=None, help="Persisted index path (defaults to <output-dir>/dedupe_index.npz).")
+    p.add_argument("--dedupe-bloom-mb", type=float, default=None, help="Bloom filter in front of the dedupe index (0 disables).")
+    p.add_argument("--near-duplicates", action="store_true",
+                   help="Tag reposted / multi-city postings with a shared cluster_id (SimHash of title + description).")
+    p.add_argument("--near-dup-distance", type=int, default=None, help="Max differing SimHash bits within a cluster.")
+    p.add_argument("--collapse-near-duplicates", action="store_true",
+                   help="Save one record per cluster with cluster_locations and cluster_size (implies --near-duplicates).")
+    p.add_argument("--description-store", action="store_true",
+                   help="Write each distinct description once (compressed, by hash); records carry description_hash.")
+    p.add_argument("--description-store-dir", default=None,
+                   help="Description store directory (defaults to <output-dir>/descriptions; may be shared across runs).")
+    p.add_argument("--coordinator", default=None, metavar="QUEUE_DB",
+                   help="Hand searches to --worker processes through this SQLite file; --max-workers is the number kept in flight.")
+    p.add_argument("--worker", default=None, metavar="QUEUE_DB",
+                   help="Lease searches from a coordinator's queue file and exit once it closes.")
+    p.add_argument("--lease-seconds", type=float, default=None, help="Lease length; expired leases are re-queued.")
+    p.add_argument("--benchmark-enrichment", action="store_true",
+                   help="Time per-row vs batch enrichment on the jobs saved in --output-dir and exit.")
+    p.add_argument("--benchmark-classifier", action="store_true",
+                   help="Time the single-pass arrangement/employment-type scanner per description and exit.")
+    p.add_argument("--self-check", action="store_true",
+                   help="Check that queued and cached searches enrich exactly like inline ones, and the classifier and "
+                        "salary parser like their reference versions, then exit (status 1 on a mismatch).")
     p.add_argument("--countries", default=None, help="Comma-separated list of countries (overrides built-in list).")
     p.add_argument("--no-exact-company-match", action="store_true", help="Disable exact company-name enforcement.")
-    return p.parse_args()
+    p.add_argument("--no-route-mismatches", action="store_true",
+                   help="Drop company mismatches instead of routing them to the group that owns the name.")
+    p.add_argument("--combine-aliases", action="store_true", help="Search each group's aliases as one OR query where they fit.")
+    p.add_argument("--geo-partitioning", action="store_true",
+                   help="Expand capped searches country -> province/state -> city, pruning partitions that never yield.")
+    p.add_argument("--history", action="append", default=None,
+                   help="Previous summary.json to estimate group cost from (repeatable; defaults to <output-dir>/summary.json).")
+    p.add_argument("--group-cost-prior", type=float, default=None, help="Predicted seconds for groups with no history.")
+    p.add_argument("--time-budget", type=parse_duration, default=None,
+                   help="Wall-clock budget (e.g. 5400, 90m, 1.5h); highest-yield searches run first, the rest are skipped.")
+    args = p.parse_args()
+    if args.resume and args.fresh:
+        p.error("--resume and --fresh are mutually exclusive")
+    if args.shard and args.shard[1] > 1 and not args.history:
+        # The default history is each host's own output summary, which differs
+        # between shards after the first run and so gives each host a different split.
+        p.error("--shard needs an explicit --history shared by every shard (e.g. the last merged summary.json)")
+    return args
 
 
 def main() -> None:
@@ -856,54 +3967,322 @@ def main() -> None:
         output_dir=args.output_dir or Config.output_dir,
         results_wanted=args.results_wanted if args.results_wanted is not None else Config.results_wanted,
         hours_old=args.hours_old if args.hours_old is not None else Config.hours_old,
+        incremental=args.incremental,
+        watermark_overlap_hours=(
+            args.watermark_overlap_hours if args.watermark_overlap_hours is not None else Config.watermark_overlap_hours
+        ),
         max_workers=args.max_workers if args.max_workers is not None else Config.max_workers,
+        requests_per_second=args.requests_per_second if args.requests_per_second is not None else Config.requests_per_second,
+        adaptive_pacing=(not args.no_adaptive_pacing),
+        breaker_skip_when_open=args.breaker_skip,
+        isolate_searches=args.isolate_searches,
+        search_timeout_seconds=args.search_timeout if args.search_timeout is not None else Config.search_timeout_seconds,
+        queue_db=args.coordinator or Config.queue_db,
+        enrich_processes=args.enrich_processes if args.enrich_processes is not None else Config.enrich_processes,
+        enrich_memo_size=args.enrich_memo_size if args.enrich_memo_size is not None else Config.enrich_memo_size,
+        lease_seconds=args.lease_seconds if args.lease_seconds is not None else Config.lease_seconds,
+        cache_ttl_seconds=args.cache_ttl if args.cache_ttl is not None else Config.cache_ttl_seconds,
+        cache_dir=args.cache_dir or Config.cache_dir,
+        cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb is not None else Config.cache_max_bytes,
+        dedupe_index=args.dedupe_index or args.persist_dedupe_index or bool(args.dedupe_index_file),
+        dedupe_index_file=(
+            args.dedupe_index_file
+            or (os.path.join(args.output_dir or Config.output_dir, DEDUPE_INDEX_FILE) if args.persist_dedupe_index else None)
+        ),
+        dedupe_bloom_bytes=int(args.dedupe_bloom_mb * 1024 * 1024) if args.dedupe_bloom_mb is not None else Config.dedupe_bloom_bytes,
+        near_duplicates=args.near_duplicates or args.collapse_near_duplicates,
+        near_dup_max_distance=args.near_dup_distance if args.near_dup_distance is not None else Config.near_dup_max_distance,
+        collapse_near_duplicates=args.collapse_near_duplicates,
+        description_store=args.description_store or bool(args.description_store_dir),
+        description_store_dir=args.description_store_dir or Config.description_store_dir,
         enforce_exact_company_match=(not args.no_exact_company_match),
+        route_mismatches=(not args.no_route_mismatches),
+        combine_aliases=args.combine_aliases,
+        geo_partitioning=args.geo_partitioning,
+        dead_search_after=args.dead_search_after if args.dead_search_after is not None else Config.dead_search_after,
+        marginal_yield_patience=args.marginal_yield_patience if args.marginal_yield_patience is not None else Config.marginal_yield_patience,
+        marginal_yield_threshold=args.marginal_yield_threshold if args.marginal_yield_threshold is not None else Config.marginal_yield_threshold,
+        group_cost_prior_seconds=args.group_cost_prior if args.group_cost_prior is not None else Config.group_cost_prior_seconds,
+        time_budget_seconds=args.time_budget if args.time_budget is not None else Config.time_budget_seconds,
+        shard_index=args.shard[0] if args.shard else Config.shard_index,
+        shard_count=args.shard[1] if args.shard else Config.shard_count,
         log_level=Config.log_level,
     )
 
     logger = setup_logging(cfg.log_level)
+    configure_enrich_memo(cfg.enrich_memo_size)
+    if args.worker:
+        run_queue_worker(cfg, logger, args.worker)
+        return
     os.makedirs(cfg.output_dir, exist_ok=True)
 
+    if args.merge:
+        merge_shards(cfg, logger, args.merge)
+        logger.info("DONE")
+        return
+    if args.benchmark_enrichment:
+        benchmark_enrichment(cfg, logger)
+        return
+    if args.benchmark_classifier:
+        benchmark_classifier(cfg, logger)
+        return
+    if args.self_check:
+        if not self_check(cfg, logger):
+            raise SystemExit(1)
+        return
+
     countries = INDEED_COUNTRIES
     if args.countries:
         countries = [c.strip() for c in args.countries.split(",") if c.strip()]
 
     logger.info(
         f"Groups={len(COMPANY_GROUPS)} Countries={len(countries)} Workers={cfg.max_workers} "
-        f"ResultsWanted={cfg.results_wanted} ExactCompanyMatch={cfg.enforce_exact_company_match}"
+        f"ResultsWanted={cfg.results_wanted} ExactCompanyMatch={cfg.enforce_exact_company_match} "
+        f"CombineAliases={cfg.combine_aliases}"
     )
 
-    group_summaries: List[Dict[str, Any]] = []
-    mismatch_examples: Dict[str, Dict[str, Any]] = {}
-
-    with ThreadPoolExecutor(max_workers=cfg.max_workers) as ex:
-        futures = {
-            ex.submit(scrape_company_group, cfg, logger, cg, aliases, countries): cg
-            for cg, aliases in COMPANY_GROUPS.items()
-        }
+    history_paths = args.history or [os.path.join(cfg.output_dir, "summary.json")]
+    history = RunHistory.load(history_paths, logger)
+    group_costs = history.group_costs(cfg, list(COMPANY_GROUPS))
 
-        for fut in as_completed(futures):
-            cg = futures[fut]
+    group_summaries: Dict[str, Dict[str, Any]] = {}
+    mismatch_examples: Dict[str, Dict[str, Any]] = {}
+    run_info: Dict[str, Any] = {}
+    outputs_lock = threading.Lock()
+
+    def on_group_done(agg: GroupAggregator) -> None:
+        with agg.lock:
+            agg.saved = True
+            agg.dirty_after_save = False
+        jobs, stats = agg.snapshot()
+        with outputs_lock:
+            run_info["pacing"] = scheduler.limiter.summary()
+            run_info["circuit_breakers"] = scheduler.breaker_summary()
             try:
-                jobs, stats, mismatch_example = fut.result()
-                summary = save_group(cfg, logger, cg, jobs, stats)
+                summary = save_group(cfg, logger, agg.company_group, jobs, stats, agg.summary_extra())
 
-                if mismatch_example is not None:
-                    mismatch_examples[cg] = mismatch_example
+                if agg.mismatch_example is not None:
+                    mismatch_examples[agg.company_group] = agg.mismatch_example
 
             except Exception as e:
-                logger.error(f"[FAIL] {cg}: {type(e).__name__}: {e}")
+                logger.error(f"[FAIL] {agg.company_group}: {type(e).__name__}: {e}")
                 summary = {
-                    "company_group": cg,
+                    "company_group": agg.company_group,
                     "scraped_at": datetime.now().isoformat(),
                     "total_jobs": 0,
                     "output_file": None,
                     "stats": {"error": f"{type(e).__name__}: {e}"},
                 }
 
-            group_summaries.append(summary)
-            save_overall_summary(cfg, logger, group_summaries)
+            group_summaries[agg.company_group] = summary
+            save_overall_summary(cfg, logger, list(group_summaries.values()), run_info)
             save_mismatch_examples(cfg, logger, mismatch_examples)
+            ledger.save()
+            watermarks.save()
+
+    aggregators = {cg: GroupAggregator(cfg, cg, aliases) for cg, aliases in COMPANY_GROUPS.items()}
+    alias_index = build_alias_index(COMPANY_GROUPS)
+    journal_path = os.path.join(cfg.output_dir, JOURNAL_FILE)
+    if not args.resume and not args.fresh and RequestJournal.unfinished(journal_path):
+        logger.error(f"[JOURNAL] {journal_path} holds an interrupted run; pass --resume to continue it or --fresh to discard it")
+        raise SystemExit(2)
+    journal = RequestJournal(journal_path, logger, resume=args.resume)
+    watermarks = Watermarks.load(os.path.join(cfg.output_dir, WATERMARKS_FILE), logger)
+    dedupe_index = None
+    if cfg.dedupe_index:
+        dedupe_index = DedupeIndex(cfg, logger, cfg.dedupe_index_file)
+        logger.info(f"[DEDUPE_INDEX] loaded={dedupe_index.loaded} file={cfg.dedupe_index_file or '-'}")
+    descriptions = DescriptionStore(description_store_dir(cfg), logger) if cfg.description_store else None
+    for agg in aggregators.values():
+        agg.connect(alias_index, aggregators, journal)
+        if cfg.incremental:
+            # Without the store every record must carry its text, including ones saved by runs that used it.
+            carried = load_group_file(cfg, logger, agg.company_group, rehydrate=descriptions is None)
+            if descriptions is None and any("description_hash" in job for job in carried):
+                logger.error(
+                    f"[DESCRIPTIONS] {agg.company_group}: saved records reference descriptions not found under "
+                    f"{description_store_dir(cfg)}; pass --description-store (and --description-store-dir) to keep them"
+                )
+                raise SystemExit(2)
+            agg.carry_over(carried)
+        if args.resume:
+            journal.restore(agg)
+        if descriptions is not None:
+            agg.descriptions = descriptions
+            agg.jobs = [descriptions.dehydrate(j) for j in agg.jobs]
+        agg.seed_clusters()
+        if dedupe_index is not None:
+            dedupe_index.observe([j["dedupe_key"] for j in agg.jobs if j.get("dedupe_key")], agg.company_group, count=False)
+            agg.dedupe_index = dedupe_index
+    ledger = YieldLedger.load(os.path.join(cfg.output_dir, YIELD_LEDGER_FILE), logger)
+    scheduler = SearchScheduler(
+        cfg, logger, aggregators, on_group_done, group_costs, history, ledger, journal, watermarks,
+    )
+
+    heaviest = sorted(group_costs, key=lambda cg: group_costs[cg], reverse=True)
+    predicted_requests = 0.0
+
+    planned = {cg: plan_group_searches(agg, countries) for cg, agg in aggregators.items()}
+    if cfg.shard_count > 1:
+        planned, shard_loads, plan_digest = shard_tasks(cfg, history, planned)
+        run_info["shard"] = {
+            "index": cfg.shard_index,
+            "count": cfg.shard_count,
+            "searches": sum(len(t) for t in planned.values()),
+            "predicted_seconds": [round(x, 1) for x in shard_loads],
+            "plan_digest": plan_digest,
+            "history": list(history_paths),
+        }
+        logger.info(
+            f"[SHARD] {cfg.shard_index}/{cfg.shard_count} searches={run_info['shard']['searches']} "
+            f"predicted_load={shard_loads[cfg.shard_index - 1]:.1f}s plan={plan_digest}"
+        )
+
+    request_plan: Dict[str, Dict[str, List[str]]] = {}
+    for agg in sorted(aggregators.values(), key=lambda a: group_costs[a.company_group], reverse=True):
+        tasks, demoted, probes = apply_probe_schedule(cfg, ledger, planned[agg.company_group])
+        for task in demoted:
+            ledger.record_skip("search", task.search_key)
+        request_plan[agg.company_group] = {
+            "searched": [f"{t.search_term} | {t.country}" for t in tasks],
+            "demoted": [f"{t.search_term} | {t.country}" for t in demoted],
+            "probes": [f"{t.search_term} | {t.country}" for t in probes],
+        }
+        hist_requests = history.group_requests(agg.company_group) if cfg.shard_count == 1 else None
+        predicted_requests += hist_requests if hist_requests is not None else len(tasks)
+        logger.info(f"[START] {agg.company_group} (aliases={len(agg.search_terms)} countries={len(countries)})")
+        if not tasks:
+            on_group_done(agg)
+            continue
+        for task in tasks:
+            scheduler.submit(task)
+
+    demoted_total = sum(len(p["demoted"]) for p in request_plan.values())
+    probes_total = sum(len(p["probes"]) for p in request_plan.values())
+    run_info["request_plan"] = {
+        "searches": scheduler.seq,
+        "demoted": demoted_total,
+        "probes": probes_total,
+        "groups": request_plan,
+    }
+    logger.info(
+        f"[PLAN] searches={scheduler.seq} demoted={demoted_total} probes={probes_total} "
+        f"rate={scheduler.limiter.rate:.2f}/s"
+    )
+
+    # The run can finish no faster than the busiest worker or the global request budget allows.
+    workers = max(1, cfg.max_workers)
+    predicted = max(
+        predict_makespan(list(group_costs.values()), workers)
+        + predicted_requests * scheduler.limiter.jitter_seconds / 2 / workers,
+        predicted_requests / scheduler.limiter.rate,
+    )
+    logger.info(f"[LPT] predicted_makespan={predicted:.1f}s heaviest={heaviest[:5]}")
+    started = time.monotonic()
+    scheduler.run()
+    actual = time.monotonic() - started
+    journal.close()
+    if args.resume:
+        logger.info(f"[RESUME] replayed {scheduler.replayed} finished searches without requests")
+
+    # Groups that finished before another group routed rows to them are saved again.
+    for agg in aggregators.values():
+        if agg.dirty_after_save:
+            on_group_done(agg)
+
+    routed = sum(a.stats.routed_out for a in aggregators.values())
+    if cfg.route_mismatches:
+        logger.info(f"[ROUTED] {routed} mismatched rows routed to their owning group")
+
+    logger.info(f"[MAKESPAN] predicted={predicted:.1f}s actual={actual:.1f}s")
+    pacing = scheduler.limiter.summary()
+    logger.info(
+        f"[PACING] rate={pacing['current_rate']}/s "
+        f"increases={pacing.get('increases', 0)} decreases={pacing.get('decreases', 0)}"
+    )
+    breakers = scheduler.breaker_summary()
+    if breakers:
+        tripped = ", ".join(f"{c} x{len(b['trips'])}" for c, b in breakers.items())
+        logger.warning(f"[BREAKERS] tripped: {tripped}")
+    with outputs_lock:
+        run_info["pacing"] = pacing
+        run_info["circuit_breakers"] = breakers
+        if cfg.marginal_yield_patience > 0:
+            run_info["early_stopping"] = scheduler.early_stop_summary()
+        ledger.save()
+        watermarks.save()
+        if descriptions is not None:
+            run_info["description_store"] = descriptions.summary()
+            logger.info(
+                f"[DESCRIPTIONS] stored={run_info['description_store']['stored']} "
+                f"reused={run_info['description_store']['reused']} bytes={run_info['description_store']['bytes_written']}"
+            )
+        if dedupe_index is not None:
+            dedupe_index.save()
+            run_info["dedupe_index"] = dedupe_index.summary()
+            logger.info(
+                f"[DEDUPE_INDEX] keys={run_info['dedupe_index']['keys']} "
+                f"other_group={run_info['dedupe_index']['seen_other_group']} "
+                f"prior_run={run_info['dedupe_index']['seen_prior_run']}"
+            )
+        run_info["makespan"] = {
+            "predicted_seconds": round(predicted, 1),
+            "actual_seconds": round(actual, 1),
+            "order": heaviest,
+        }
+        if cfg.time_budget_seconds:
+            skipped = sum(len(a.skipped_searches) for a in aggregators.values())
+            run_info["time_budget"] = {
+                "budget_seconds": cfg.time_budget_seconds,
+                "spent_seconds": round(actual, 1),
+                "skipped_searches": skipped,
+                "partial_groups": sorted(cg for cg, a in aggregators.items() if a.skipped_searches),
+            }
+            logger.info(f"[BUDGET] budget={cfg.time_budget_seconds:.0f}s spent={actual:.1f}s skipped_searches={skipped}")
+        if scheduler.enrichment is not None:
+            run_info["enrichment_pool"] = scheduler.enrichment.summary()
+            logger.info(
+                f"[ENRICH] batches={run_info['enrichment_pool']['batches']} "
+                f"rows={run_info['enrichment_pool']['rows']} "
+                f"inline={run_info['enrichment_pool']['inline_batches']} "
+                f"restarts={run_info['enrichment_pool']['restarts']}"
+            )
+        if isinstance(scheduler.pool, LeaseQueue):
+            run_info["work_queue"] = scheduler.pool.summary()
+        if scheduler.cache is not None:
+            run_info["search_cache"] = scheduler.cache.summary()
+            logger.info(
+                f"[CACHE] hits={run_info['search_cache']['hits']} misses={run_info['search_cache']['misses']} "
+                f"evicted={run_info['search_cache']['evicted']}"
+            )
+        stages: Dict[str, Dict[str, float]] = {}
+        for a in aggregators.values():
+            add_stage_totals(stages, a.stats.stages)
+        run_info["ingest_stages"] = {name: stages[name] for name in INGEST_STAGES if name in stages}
+        logger.info(
+            "[INGEST] " + " ".join(
+                f"{name}={entry['rows_in']}->{entry['rows_out']}/{entry['seconds']:.2f}s"
+                for name, entry in run_info["ingest_stages"].items()
+            )
+        )
+        if cfg.near_duplicates:
+            run_info["near_duplicates"] = {
+                "max_distance": cfg.near_dup_max_distance,
+                "clustered_rows": sum(a.stats.near_duplicates for a in aggregators.values()),
+                "collapsed": cfg.collapse_near_duplicates,
+            }
+            logger.info(f"[NEAR_DUP] rows joining an existing cluster: {run_info['near_duplicates']['clustered_rows']}")
+        if cfg.route_mismatches:
+            run_info["routing"] = {
+                "routed_rows": routed,
+                "by_group": {
+                    cg: {"routed_out": a.stats.routed_out, "routed_in": a.stats.routed_in}
+                    for cg, a in aggregators.items()
+                    if a.stats.routed_out or a.stats.routed_in
+                },
+            }
+        save_overall_summary(cfg, logger, list(group_summaries.values()), run_info)
+    journal.mark_finished()
 
     logger.info("DONE")
 